@@ -39,6 +39,9 @@ setup(
         "spotipy>=2.23.0",
     ],
     extras_require={
+        "fast": [
+            "orjson>=3.6.0",
+        ],
         "dev": [
             "pytest>=7.0.0",
             "pytest-cov>=4.0.0",
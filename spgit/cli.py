@@ -4,217 +4,345 @@ Main CLI entry point for spgit.
 
 import sys
 import argparse
-from . import __version__
-
-# Import all commands
-from .commands.init import init_command
-from .commands.clone import clone_command
-from .commands.fork import fork_command
-from .commands.config import config_command
-from .commands.add import add_command
-from .commands.commit import commit_command
-from .commands.status import status_command
-from .commands.diff import diff_command
-from .commands.compare import compare_command
-from .commands.log import log_command
-from .commands.branch import branch_command
-from .commands.checkout import checkout_command
-from .commands.merge import merge_command
-from .commands.pull import pull_command
-from .commands.push import push_command
-from .commands.fetch import fetch_command
-from .commands.remote import remote_command
-from .commands.reset import reset_command
-from .commands.revert import revert_command
-from .commands.stash import stash_command
-from .commands.tag import tag_command
-from .commands.show import show_command
-from .commands.cherrypick import cherrypick_command
-from .commands.rebase import rebase_command
-from .commands.blame import blame_command
-from .commands.reflog import reflog_command
-
-
-def create_parser():
-    """Create argument parser."""
+import importlib
+from types import MappingProxyType
+from typing import Optional
+
+# Command name -> module basename under spgit.commands. Modules are imported
+# on demand so a single invocation only loads the command it runs. The map
+# is built once per process and exposed read-only.
+COMMAND_MODULES = MappingProxyType({
+    'init': 'init',
+    'clone': 'clone',
+    'fork': 'fork',
+    'config': 'config',
+    'add': 'add',
+    'commit': 'commit',
+    'status': 'status',
+    'diff': 'diff',
+    'compare': 'compare',
+    'log': 'log',
+    'branch': 'branch',
+    'checkout': 'checkout',
+    'merge': 'merge',
+    'pull': 'pull',
+    'push': 'push',
+    'fetch': 'fetch',
+    'remote': 'remote',
+    'reset': 'reset',
+    'revert': 'revert',
+    'stash': 'stash',
+    'tag': 'tag',
+    'show': 'show',
+    'cherry-pick': 'cherrypick',
+    'rebase': 'rebase',
+    'blame': 'blame',
+    'reflog': 'reflog',
+})
+
+
+def _add_init_arguments(parser):
+    parser.add_argument('--name', help='Playlist name')
+
+
+def _add_clone_arguments(parser):
+    parser.add_argument('url', help='Spotify playlist URL')
+    parser.add_argument('directory', nargs='?', help='Directory name')
+
+
+def _add_fork_arguments(parser):
+    parser.add_argument('url', help='Source Spotify playlist URL')
+    parser.add_argument('--name', help='Name for your new playlist')
+    parser.add_argument('--directory', help='Local directory name')
+
+
+def _add_config_arguments(parser):
+    parser.add_argument('--global', dest='global_config', action='store_true', help='Use global config')
+    parser.add_argument('--list', action='store_true', help='List all configuration')
+    parser.add_argument('--get', help='Get a configuration value')
+    parser.add_argument('--set', nargs=2, metavar=('KEY', 'VALUE'), help='Set a configuration value')
+    parser.add_argument('--unset', help='Unset a configuration value')
+
+
+def _add_add_arguments(parser):
+    parser.add_argument('files', nargs='*', help='Track URIs to add (or use "." for all)')
+    parser.add_argument('-a', '--all', action='store_true', help='Add all tracks')
+
+
+def _add_commit_arguments(parser):
+    parser.add_argument('-m', '--message', required=True, help='Commit message')
+
+
+def _add_status_arguments(parser):
+    pass
+
+
+def _add_diff_arguments(parser):
+    parser.add_argument('--staged', action='store_true', help='Show staged changes')
+
+
+def _add_compare_arguments(parser):
+    parser.add_argument('--remote', default='upstream', help='Remote to compare with (default: upstream)')
+
+
+def _add_log_arguments(parser):
+    parser.add_argument('--oneline', action='store_true', help='Show one line per commit')
+    parser.add_argument('--graph', action='store_true', help='Show graph')
+    parser.add_argument('-n', '--limit', type=int, help='Limit number of commits')
+
+
+def _add_branch_arguments(parser):
+    parser.add_argument('branch_name', nargs='?', help='Branch name to create')
+    parser.add_argument('-d', '--delete', help='Delete branch')
+
+
+def _add_checkout_arguments(parser):
+    parser.add_argument('branch', help='Branch name or commit hash')
+    parser.add_argument('-b', dest='create_branch', action='store_true', help='Create and checkout new branch')
+
+
+def _add_merge_arguments(parser):
+    parser.add_argument('branch', nargs='?', help='Branch to merge')
+    parser.add_argument('--strategy', choices=['union', 'append', 'intersection'], default='union', help='Merge strategy')
+    parser.add_argument('--stdin', action='store_true', help="Read 'branch1 branch2' pairs from stdin and print each merge result without changing anything")
+
+
+def _add_pull_arguments(parser):
+    parser.add_argument('remote', nargs='?', default='origin', help='Remote name')
+
+
+def _add_push_arguments(parser):
+    parser.add_argument('remote', nargs='?', default='origin', help='Remote name')
+
+
+def _add_fetch_arguments(parser):
+    parser.add_argument('remote', nargs='?', default='origin', help='Remote name')
+
+
+def _add_remote_arguments(parser):
+    parser.add_argument('-v', '--verbose', action='store_true', help='Show URLs')
+    parser.add_argument('--add', nargs=2, metavar=('NAME', 'URL'), help='Add remote')
+    parser.add_argument('--remove', help='Remove remote')
+
+
+def _add_reset_arguments(parser):
+    parser.add_argument('commit', nargs='?', default='HEAD', help='Commit to reset to')
+    parser.add_argument('--soft', action='store_true', help='Soft reset')
+    parser.add_argument('--mixed', action='store_true', help='Mixed reset (default)')
+    parser.add_argument('--hard', action='store_true', help='Hard reset')
+
+
+def _add_revert_arguments(parser):
+    parser.add_argument('commit', help='Commit to revert')
+
+
+def _add_stash_arguments(parser):
+    parser.add_argument('action', nargs='?', choices=['save', 'list', 'pop', 'apply', 'drop'], default='save', help='Stash action')
+    parser.add_argument('--message', '-m', help='Stash message')
+    parser.add_argument('stash', nargs='?', help='Stash to apply/drop')
+
+
+def _add_tag_arguments(parser):
+    parser.add_argument('tag_name', nargs='?', help='Tag name to create')
+    parser.add_argument('commit', nargs='?', help='Commit to tag')
+    parser.add_argument('-d', '--delete', help='Delete tag')
+
+
+def _add_show_arguments(parser):
+    parser.add_argument('commit', nargs='?', help='Commit to show')
+
+
+def _add_cherrypick_arguments(parser):
+    parser.add_argument('commit', help='Commit to cherry-pick')
+
+
+def _add_rebase_arguments(parser):
+    parser.add_argument('branch', help='Branch to rebase onto')
+
+
+def _add_blame_arguments(parser):
+    parser.add_argument('track', help='Track URI')
+
+
+def _add_reflog_arguments(parser):
+    parser.add_argument('ref', nargs='?', default='HEAD', help='Reference to show')
+
+
+# Command name -> (help text, argument builder), in help listing order.
+SUBCOMMANDS = {
+    'init': ('Initialize a new repository', _add_init_arguments),
+    'clone': ('Clone a Spotify playlist', _add_clone_arguments),
+    'fork': ('Fork a playlist (clone and create your own copy on Spotify)', _add_fork_arguments),
+    'config': ('Configure spgit', _add_config_arguments),
+    'add': ('Add tracks to staging area', _add_add_arguments),
+    'commit': ('Record changes to repository', _add_commit_arguments),
+    'status': ('Show working tree status', _add_status_arguments),
+    'diff': ('Show changes', _add_diff_arguments),
+    'compare': ('Compare with upstream or another remote', _add_compare_arguments),
+    'log': ('Show commit logs', _add_log_arguments),
+    'branch': ('List, create, or delete branches', _add_branch_arguments),
+    'checkout': ('Switch branches', _add_checkout_arguments),
+    'merge': ('Merge branches', _add_merge_arguments),
+    'pull': ('Fetch and merge from Spotify', _add_pull_arguments),
+    'push': ('Update Spotify playlist', _add_push_arguments),
+    'fetch': ('Download from Spotify', _add_fetch_arguments),
+    'remote': ('Manage remotes', _add_remote_arguments),
+    'reset': ('Reset current HEAD', _add_reset_arguments),
+    'revert': ('Revert a commit', _add_revert_arguments),
+    'stash': ('Stash changes', _add_stash_arguments),
+    'tag': ('Create, list, or delete tags', _add_tag_arguments),
+    'show': ('Show commit details', _add_show_arguments),
+    'cherry-pick': ('Apply changes from a specific commit', _add_cherrypick_arguments),
+    'rebase': ('Reapply commits on top of another branch', _add_rebase_arguments),
+    'blame': ('Show when track was added', _add_blame_arguments),
+    'reflog': ('Show reference logs', _add_reflog_arguments),
+}
+
+
+# argparse titles the options section "options:" from Python 3.10 on
+_OPTIONS_HEADING = "options:" if sys.version_info >= (3, 10) else "optional arguments:"
+
+# Top-level help, generated from create_parser(stubs=True) at COLUMNS=80 and
+# checked in so bare "spgit" and "spgit --help" never build a parser.
+# Regenerate when SUBCOMMANDS changes (tests/test_cli.py checks it).
+_PRINT_HELP_FAST = """\
+usage: spgit [-h] [--version]
+             {init,clone,fork,config,add,commit,status,diff,compare,log,branch,checkout,merge,pull,push,fetch,remote,reset,revert,stash,tag,show,cherry-pick,rebase,blame,reflog}
+             ...
+
+Git for Spotify Playlists
+
+positional arguments:
+  {init,clone,fork,config,add,commit,status,diff,compare,log,branch,checkout,merge,pull,push,fetch,remote,reset,revert,stash,tag,show,cherry-pick,rebase,blame,reflog}
+                        Available commands
+    init                Initialize a new repository
+    clone               Clone a Spotify playlist
+    fork                Fork a playlist (clone and create your own copy on
+                        Spotify)
+    config              Configure spgit
+    add                 Add tracks to staging area
+    commit              Record changes to repository
+    status              Show working tree status
+    diff                Show changes
+    compare             Compare with upstream or another remote
+    log                 Show commit logs
+    branch              List, create, or delete branches
+    checkout            Switch branches
+    merge               Merge branches
+    pull                Fetch and merge from Spotify
+    push                Update Spotify playlist
+    fetch               Download from Spotify
+    remote              Manage remotes
+    reset               Reset current HEAD
+    revert              Revert a commit
+    stash               Stash changes
+    tag                 Create, list, or delete tags
+    show                Show commit details
+    cherry-pick         Apply changes from a specific commit
+    rebase              Reapply commits on top of another branch
+    blame               Show when track was added
+    reflog              Show reference logs
+
+""" + _OPTIONS_HEADING + """
+  -h, --help            show this help message and exit
+  --version             show program's version number and exit
+
+Use "spgit <command> --help" for more information about a command.
+"""
+
+
+class _VersionAction(argparse.Action):
+    """Print the version, reading it from the package only when requested."""
+
+    def __init__(self, option_strings, dest=argparse.SUPPRESS,
+                 default=argparse.SUPPRESS, help="show program's version number and exit"):
+        super().__init__(option_strings=option_strings, dest=dest,
+                         default=default, nargs=0, help=help)
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        from . import __version__
+        print(f'spgit {__version__}')
+        parser.exit()
+
+
+def create_parser(command: Optional[str] = None, stubs: bool = False):
+    """
+    Create argument parser.
+
+    Args:
+        command: Only build the subparser for this command
+        stubs: Register commands without their arguments (enough for top-level help)
+
+    Returns:
+        ArgumentParser instance
+    """
     parser = argparse.ArgumentParser(
         prog='spgit',
         description='Git for Spotify Playlists',
         epilog='Use "spgit <command> --help" for more information about a command.'
     )
 
-    parser.add_argument('--version', action='version', version=f'spgit {__version__}')
+    parser.add_argument('--version', action=_VersionAction)
 
     subparsers = parser.add_subparsers(dest='command', help='Available commands')
 
-    # init
-    init_parser = subparsers.add_parser('init', help='Initialize a new repository')
-    init_parser.add_argument('--name', help='Playlist name')
-
-    # clone
-    clone_parser = subparsers.add_parser('clone', help='Clone a Spotify playlist')
-    clone_parser.add_argument('url', help='Spotify playlist URL')
-    clone_parser.add_argument('directory', nargs='?', help='Directory name')
-
-    # fork
-    fork_parser = subparsers.add_parser('fork', help='Fork a playlist (clone and create your own copy on Spotify)')
-    fork_parser.add_argument('url', help='Source Spotify playlist URL')
-    fork_parser.add_argument('--name', help='Name for your new playlist')
-    fork_parser.add_argument('--directory', help='Local directory name')
-
-    # config
-    config_parser = subparsers.add_parser('config', help='Configure spgit')
-    config_parser.add_argument('--global', dest='global_config', action='store_true', help='Use global config')
-    config_parser.add_argument('--list', action='store_true', help='List all configuration')
-    config_parser.add_argument('--get', help='Get a configuration value')
-    config_parser.add_argument('--set', nargs=2, metavar=('KEY', 'VALUE'), help='Set a configuration value')
-    config_parser.add_argument('--unset', help='Unset a configuration value')
-
-    # add
-    add_parser = subparsers.add_parser('add', help='Add tracks to staging area')
-    add_parser.add_argument('files', nargs='*', help='Track URIs to add (or use "." for all)')
-    add_parser.add_argument('-a', '--all', action='store_true', help='Add all tracks')
-
-    # commit
-    commit_parser = subparsers.add_parser('commit', help='Record changes to repository')
-    commit_parser.add_argument('-m', '--message', required=True, help='Commit message')
-
-    # status
-    status_parser = subparsers.add_parser('status', help='Show working tree status')
-
-    # diff
-    diff_parser = subparsers.add_parser('diff', help='Show changes')
-    diff_parser.add_argument('--staged', action='store_true', help='Show staged changes')
-
-    # compare
-    compare_parser = subparsers.add_parser('compare', help='Compare with upstream or another remote')
-    compare_parser.add_argument('--remote', default='upstream', help='Remote to compare with (default: upstream)')
-
-    # log
-    log_parser = subparsers.add_parser('log', help='Show commit logs')
-    log_parser.add_argument('--oneline', action='store_true', help='Show one line per commit')
-    log_parser.add_argument('--graph', action='store_true', help='Show graph')
-    log_parser.add_argument('-n', '--limit', type=int, help='Limit number of commits')
-
-    # branch
-    branch_parser = subparsers.add_parser('branch', help='List, create, or delete branches')
-    branch_parser.add_argument('branch_name', nargs='?', help='Branch name to create')
-    branch_parser.add_argument('-d', '--delete', help='Delete branch')
-
-    # checkout
-    checkout_parser = subparsers.add_parser('checkout', help='Switch branches')
-    checkout_parser.add_argument('branch', help='Branch name or commit hash')
-    checkout_parser.add_argument('-b', dest='create_branch', action='store_true', help='Create and checkout new branch')
-
-    # merge
-    merge_parser = subparsers.add_parser('merge', help='Merge branches')
-    merge_parser.add_argument('branch', help='Branch to merge')
-    merge_parser.add_argument('--strategy', choices=['union', 'append', 'intersection'], default='union', help='Merge strategy')
-
-    # pull
-    pull_parser = subparsers.add_parser('pull', help='Fetch and merge from Spotify')
-    pull_parser.add_argument('remote', nargs='?', default='origin', help='Remote name')
-
-    # push
-    push_parser = subparsers.add_parser('push', help='Update Spotify playlist')
-    push_parser.add_argument('remote', nargs='?', default='origin', help='Remote name')
-
-    # fetch
-    fetch_parser = subparsers.add_parser('fetch', help='Download from Spotify')
-    fetch_parser.add_argument('remote', nargs='?', default='origin', help='Remote name')
-
-    # remote
-    remote_parser = subparsers.add_parser('remote', help='Manage remotes')
-    remote_parser.add_argument('-v', '--verbose', action='store_true', help='Show URLs')
-    remote_parser.add_argument('--add', nargs=2, metavar=('NAME', 'URL'), help='Add remote')
-    remote_parser.add_argument('--remove', help='Remove remote')
-
-    # reset
-    reset_parser = subparsers.add_parser('reset', help='Reset current HEAD')
-    reset_parser.add_argument('commit', nargs='?', default='HEAD', help='Commit to reset to')
-    reset_parser.add_argument('--soft', action='store_true', help='Soft reset')
-    reset_parser.add_argument('--mixed', action='store_true', help='Mixed reset (default)')
-    reset_parser.add_argument('--hard', action='store_true', help='Hard reset')
-
-    # revert
-    revert_parser = subparsers.add_parser('revert', help='Revert a commit')
-    revert_parser.add_argument('commit', help='Commit to revert')
-
-    # stash
-    stash_parser = subparsers.add_parser('stash', help='Stash changes')
-    stash_parser.add_argument('action', nargs='?', choices=['save', 'list', 'pop', 'apply', 'drop'], default='save', help='Stash action')
-    stash_parser.add_argument('--message', '-m', help='Stash message')
-    stash_parser.add_argument('stash', nargs='?', help='Stash to apply/drop')
-
-    # tag
-    tag_parser = subparsers.add_parser('tag', help='Create, list, or delete tags')
-    tag_parser.add_argument('tag_name', nargs='?', help='Tag name to create')
-    tag_parser.add_argument('commit', nargs='?', help='Commit to tag')
-    tag_parser.add_argument('-d', '--delete', help='Delete tag')
-
-    # show
-    show_parser = subparsers.add_parser('show', help='Show commit details')
-    show_parser.add_argument('commit', nargs='?', help='Commit to show')
-
-    # cherry-pick
-    cherrypick_parser = subparsers.add_parser('cherry-pick', help='Apply changes from a specific commit')
-    cherrypick_parser.add_argument('commit', help='Commit to cherry-pick')
-
-    # rebase
-    rebase_parser = subparsers.add_parser('rebase', help='Reapply commits on top of another branch')
-    rebase_parser.add_argument('branch', help='Branch to rebase onto')
-
-    # blame
-    blame_parser = subparsers.add_parser('blame', help='Show when track was added')
-    blame_parser.add_argument('track', help='Track URI')
-
-    # reflog
-    reflog_parser = subparsers.add_parser('reflog', help='Show reference logs')
-    reflog_parser.add_argument('ref', nargs='?', default='HEAD', help='Reference to show')
+    for name, (help_text, add_arguments) in SUBCOMMANDS.items():
+        if command is not None and name != command:
+            continue
+        if stubs:
+            subparsers.add_parser(name, help=help_text, add_help=False)
+        else:
+            add_arguments(subparsers.add_parser(name, help=help_text))
 
     return parser
 
 
+# Exact argv -> parsed arguments for the most common invocations, so they
+# skip building and running a parser. Must match what argparse would produce.
+_FASTPATH_ARGS = {
+    ('status',): {'command': 'status'},
+    ('add', '.'): {'command': 'add', 'files': ['.'], 'all': False},
+}
+
+
+def _sniff_command(argv) -> Optional[str]:
+    """Return the subcommand named on the command line, if any."""
+    for arg in argv:
+        if not arg.startswith('-'):
+            return arg if arg in SUBCOMMANDS else None
+    return None
+
+
 def main():
     """Main entry point."""
-    parser = create_parser()
-    args = parser.parse_args()
+    argv = sys.argv[1:]
+    if not argv or argv in (['-h'], ['--help']):
+        sys.stdout.write(_PRINT_HELP_FAST)
+        return 0
+
+    fast_args = _FASTPATH_ARGS.get(tuple(argv))
+    if fast_args is not None:
+        parser = None
+        args = argparse.Namespace(**fast_args)
+    else:
+        command = _sniff_command(argv)
+        if command:
+            parser = create_parser(command)
+        else:
+            parser = create_parser(stubs=True)
+        args = parser.parse_args()
 
     if not args.command:
         parser.print_help()
         return 0
 
     # Route to appropriate command
-    commands = {
-        'init': init_command,
-        'clone': clone_command,
-        'fork': fork_command,
-        'config': config_command,
-        'add': add_command,
-        'commit': commit_command,
-        'status': status_command,
-        'diff': diff_command,
-        'compare': compare_command,
-        'log': log_command,
-        'branch': branch_command,
-        'checkout': checkout_command,
-        'merge': merge_command,
-        'pull': pull_command,
-        'push': push_command,
-        'fetch': fetch_command,
-        'remote': remote_command,
-        'reset': reset_command,
-        'revert': revert_command,
-        'stash': stash_command,
-        'tag': tag_command,
-        'show': show_command,
-        'cherry-pick': cherrypick_command,
-        'rebase': rebase_command,
-        'blame': blame_command,
-        'reflog': reflog_command,
-    }
-
-    command_func = commands.get(args.command)
+    module_name = COMMAND_MODULES.get(args.command)
+    command_func = None
+    if module_name:
+        module = importlib.import_module(f'.commands.{module_name}', package='spgit')
+        command_func = getattr(module, f'{module_name}_command')
+
     if command_func:
         try:
             return command_func(args)
@@ -223,8 +351,8 @@ def main():
             return 130
         except Exception as e:
             print(f"Error: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            from .utils.errors import maybe_print_traceback
+            maybe_print_traceback()
             return 1
     else:
         print(f"Unknown command: {args.command}")
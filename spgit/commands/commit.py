@@ -1,76 +1,50 @@
 """commit command implementation"""
 
 from ..core.repository import find_repository
-from ..core.objects import Commit, write_object
-from ..utils.colors import success, error, info, branch as branch_color
+from ..utils.colors import error, branch as branch_color
+from ..utils.errors import spgit_command
 
 
+@spgit_command
 def commit_command(args):
     """Create a new commit."""
-    try:
-        repo = find_repository()
-        if not repo:
-            print(error("Fatal: not a spgit repository"))
-            return 1
-
-        # Get commit message
-        if not hasattr(args, 'message') or not args.message:
-            print(error("Fatal: no commit message provided. Use -m flag."))
-            return 1
-
-        message = args.message
+    repo = find_repository()
+    if not repo:
+        print(error("Fatal: not a spgit repository"))
+        return 1
 
-        # Get current branch and HEAD
-        current_branch = repo.get_current_branch()
-        head_commit = repo.get_head_commit()
+    # Get commit message
+    if not args.message:
+        print(error("Fatal: no commit message provided. Use -m flag."))
+        return 1
 
-        if not current_branch:
-            print(error("Fatal: cannot commit to detached HEAD"))
-            return 1
+    message = args.message
 
-        # Get staged changes
-        index = repo.read_index()
-        tree = index.get("tree", {})
+    # Get current branch and HEAD
+    current_branch = repo.get_current_branch()
+    head_commit = repo.get_head_commit()
 
-        if not tree:
-            print(error("Nothing to commit"))
-            return 1
+    if not current_branch:
+        print(error("Fatal: cannot commit to detached HEAD"))
+        return 1
 
-        # Create commit
-        commit = Commit(
-            tree=tree,
-            parent=head_commit,
-            message=message,
-            author="spgit",
-            committer="spgit"
-        )
-        commit_hash = write_object(repo, commit)
+    # Get staged changes
+    index = repo.read_index()
+    tree = index.get("tree", {})
 
-        # Update branch
-        repo._update_ref(f"refs/heads/{current_branch}", commit_hash)
-        repo._update_reflog(
-            f"refs/heads/{current_branch}",
-            head_commit,
-            commit_hash,
-            f"commit: {message}"
-        )
-        repo._update_reflog(
-            "HEAD",
-            head_commit,
-            commit_hash,
-            f"commit: {message}"
-        )
+    if not tree:
+        print(error("Nothing to commit"))
+        return 1
 
-        # Count changes
-        track_count = len(tree)
+    # Create commit and advance the branch
+    commit_hash = repo.commit_tracks(
+        current_branch, tree, message, parent=head_commit, log_head=True
+    )
 
-        print(f"[{branch_color(current_branch)} {commit_hash[:7]}] {message}")
-        print(f"{track_count} track{'s' if track_count != 1 else ''}")
+    # Count changes
+    track_count = len(tree)
 
-        return 0
+    print(f"[{branch_color(current_branch)} {commit_hash[:7]}] {message}")
+    print(f"{track_count} track{'s' if track_count != 1 else ''}")
 
-    except Exception as e:
-        print(error(f"Fatal: {str(e)}"))
-        import traceback
-        traceback.print_exc()
-        return 1
+    return 0
@@ -3,49 +3,44 @@
 from ..core.repository import find_repository
 from ..core.objects import get_commit_tree, Track
 from ..utils.colors import error, added, removed, bold, green, red
+from ..utils.errors import spgit_command
 
 
+@spgit_command
 def diff_command(args):
     """Show differences between commits, commit and working tree, etc."""
-    try:
-        repo = find_repository()
-        if not repo:
-            print(error("Fatal: not a spgit repository"))
-            return 1
-
-        staged = hasattr(args, 'staged') and args.staged
+    repo = find_repository()
+    if not repo:
+        print(error("Fatal: not a spgit repository"))
+        return 1
 
-        # Get HEAD commit tracks
-        head_commit = repo.get_head_commit()
-        head_tracks = {}
-        if head_commit:
-            head_tracks = get_commit_tree(repo, head_commit)
+    staged = args.staged
 
-        if staged:
-            # Show diff between HEAD and index (staged changes)
-            index = repo.read_index()
-            staged_tracks = {}
-            if "tracks" in index:
-                staged_tracks = {uri: Track.from_dict(data) for uri, data in index["tracks"].items()}
+    # Get HEAD commit tracks
+    head_commit = repo.get_head_commit()
+    head_tracks = {}
+    if head_commit:
+        head_tracks = get_commit_tree(repo, head_commit)
 
-            _show_diff(head_tracks, staged_tracks)
-        else:
-            # Show diff between index and working tree (would need Spotify fetch)
-            # For now, show staged vs HEAD
-            index = repo.read_index()
-            staged_tracks = {}
-            if "tracks" in index:
-                staged_tracks = {uri: Track.from_dict(data) for uri, data in index["tracks"].items()}
+    if staged:
+        # Show diff between HEAD and index (staged changes)
+        index = repo.read_index()
+        staged_tracks = {}
+        if "tracks" in index:
+            staged_tracks = {uri: Track.from_dict(data) for uri, data in index["tracks"].items()}
 
-            _show_diff(head_tracks, staged_tracks)
+        _show_diff(head_tracks, staged_tracks)
+    else:
+        # Show diff between index and working tree (would need Spotify fetch)
+        # For now, show staged vs HEAD
+        index = repo.read_index()
+        staged_tracks = {}
+        if "tracks" in index:
+            staged_tracks = {uri: Track.from_dict(data) for uri, data in index["tracks"].items()}
 
-        return 0
+        _show_diff(head_tracks, staged_tracks)
 
-    except Exception as e:
-        print(error(f"Fatal: {str(e)}"))
-        import traceback
-        traceback.print_exc()
-        return 1
+    return 0
 
 
 def _show_diff(old_tracks, new_tracks):
@@ -1,40 +1,52 @@
 """fetch command implementation"""
 
 from ..core.repository import find_repository
-from ..core.spotify import get_spotify_client
+from ..core.objects import Commit, create_tree_from_track_dicts, read_object, write_object
 from ..utils.colors import error, success, info
+from ..utils.errors import spgit_command
 
 
+@spgit_command
 def fetch_command(args):
     """Download from Spotify without merging."""
-    try:
-        repo = find_repository()
-        if not repo:
-            print(error("Fatal: not a spgit repository"))
-            return 1
-
-        remote = args.remote if hasattr(args, 'remote') and args.remote else "origin"
-
-        # Get remote URL
-        remote_url = repo.get_remote_url(remote)
-        if not remote_url:
-            print(error(f"Remote '{remote}' not found"))
-            return 1
-
-        print(info(f"Fetching from {remote}..."))
-
-        # Fetch from Spotify
-        sp = get_spotify_client(repo)
-        playlist_id = sp.get_playlist_id(remote_url)
-        tracks = sp.get_playlist_tracks(playlist_id)
-
-        print(info(f"Received {len(tracks)} tracks"))
-        print(success(f"Successfully fetched from {remote}"))
-        print(info("Run 'spgit merge' to merge changes"))
-        return 0
-
-    except Exception as e:
-        print(error(f"Fatal: {str(e)}"))
-        import traceback
-        traceback.print_exc()
+    repo = find_repository()
+    if not repo:
+        print(error("Fatal: not a spgit repository"))
         return 1
+
+    remote = args.remote or "origin"
+
+    # Get remote URL
+    remote_url = repo.get_remote_url(remote)
+    if not remote_url:
+        print(error(f"Remote '{remote}' not found"))
+        return 1
+
+    print(info(f"Fetching from {remote}..."))
+
+    # Fetch from Spotify
+    from ..core.spotify import get_spotify_client
+    sp = get_spotify_client(repo)
+    playlist_id = sp.get_playlist_id(remote_url)
+    tracks = sp.get_playlist_tracks_raw(playlist_id)
+
+    print(info(f"Received {len(tracks)} tracks"))
+
+    # Record the fetched state as refs/remotes/<remote>/main
+    tree = create_tree_from_track_dicts(repo, tracks.values())
+    old_commit = repo.get_remote_commit(remote)
+    if not old_commit or read_object(repo, old_commit).tree != tree:
+        commit = Commit(
+            tree=tree,
+            parent=old_commit,
+            message=f"Fetch from {remote}",
+            author="spgit",
+            committer="spgit"
+        )
+        commit_hash = write_object(repo, commit)
+        ref = f"refs/remotes/{remote}/main"
+        repo._update_ref(ref, commit_hash)
+        repo._update_reflog(ref, old_commit, commit_hash, f"fetch {remote}")
+    print(success(f"Successfully fetched from {remote}"))
+    print(info("Run 'spgit merge' to merge changes"))
+    return 0
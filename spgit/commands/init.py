@@ -2,23 +2,20 @@
 
 from ..core.repository import Repository
 from ..utils.colors import success, error
+from ..utils.errors import spgit_command
 
 
+@spgit_command(show_traceback=False)
 def init_command(args):
     """Initialize a new spgit repository."""
-    try:
-        repo = Repository()
+    repo = Repository()
 
-        if repo.exists():
-            print(error("Fatal: Repository already exists"))
-            return 1
-
-        playlist_name = args.name if hasattr(args, 'name') and args.name else None
-        repo.init(playlist_name)
+    if repo.exists():
+        print(error("Fatal: Repository already exists"))
+        return 1
 
-        print(success(f"Initialized empty spgit repository in {repo.spgit_dir}"))
-        return 0
+    playlist_name = args.name
+    repo.init(playlist_name)
 
-    except Exception as e:
-        print(error(f"Fatal: {str(e)}"))
-        return 1
+    print(success(f"Initialized empty spgit repository in {repo.spgit_dir}"))
+    return 0
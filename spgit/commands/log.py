@@ -1,72 +1,68 @@
 """log command implementation"""
 
+from collections import deque
 from ..core.repository import find_repository
 from ..core.objects import read_object, Commit
-from ..utils.colors import error, commit_hash, yellow, gray, bold
+from ..utils.colors import error, commit_hash
 from ..utils.helpers import format_timestamp
+from ..utils.errors import spgit_command
 
 
+@spgit_command
 def log_command(args):
     """Show commit logs."""
-    try:
-        repo = find_repository()
-        if not repo:
-            print(error("Fatal: not a spgit repository"))
-            return 1
-
-        head_commit = repo.get_head_commit()
-        if not head_commit:
-            print(error("Fatal: no commits yet"))
-            return 1
+    repo = find_repository()
+    if not repo:
+        print(error("Fatal: not a spgit repository"))
+        return 1
 
-        # Get formatting options
-        oneline = hasattr(args, 'oneline') and args.oneline
-        graph = hasattr(args, 'graph') and args.graph
-        limit = args.limit if hasattr(args, 'limit') and args.limit else None
+    head_commit = repo.get_head_commit()
+    if not head_commit:
+        print(error("Fatal: no commits yet"))
+        return 1
 
-        # Build commit history
-        commits = []
-        visited = set()
-        queue = [head_commit]
-        count = 0
+    # Get formatting options
+    oneline = args.oneline
+    graph = args.graph
+    limit = args.limit
 
-        while queue and (limit is None or count < limit):
-            current_hash = queue.pop(0)
-            if current_hash in visited:
-                continue
+    # Build commit history
+    commits = []
+    visited = set()
+    queue = deque([head_commit])
+    count = 0
 
-            visited.add(current_hash)
+    while queue and (limit is None or count < limit):
+        current_hash = queue.popleft()
+        if current_hash in visited:
+            continue
 
-            try:
-                commit = read_object(repo, current_hash)
-                if isinstance(commit, Commit):
-                    commits.append((current_hash, commit))
-                    queue.extend(commit.parents)
-                    count += 1
-            except ValueError:
-                pass
+        visited.add(current_hash)
 
-        # Display commits
-        for current_hash, commit in commits:
-            if oneline:
-                # One-line format
-                short_hash = commit_hash(current_hash[:7])
-                first_line = commit.message.split('\n')[0]
-                print(f"{short_hash} {first_line}")
-            else:
-                # Full format
-                print(commit_hash(f"commit {current_hash}"))
-                print(f"Author: {commit.author}")
-                print(f"Date:   {format_timestamp(commit.timestamp)}")
-                print()
-                for line in commit.message.split('\n'):
-                    print(f"    {line}")
-                print()
+        try:
+            commit = read_object(repo, current_hash)
+            if isinstance(commit, Commit):
+                commits.append((current_hash, commit))
+                queue.extend(commit.parents)
+                count += 1
+        except ValueError:
+            pass
 
-        return 0
+    # Display commits
+    for current_hash, commit in commits:
+        if oneline:
+            # One-line format
+            short_hash = commit_hash(current_hash[:7])
+            first_line = commit.message.split('\n')[0]
+            print(f"{short_hash} {first_line}")
+        else:
+            # Full format
+            print(commit_hash(f"commit {current_hash}"))
+            print(f"Author: {commit.author}")
+            print(f"Date:   {format_timestamp(commit.timestamp)}")
+            print()
+            for line in commit.message.split('\n'):
+                print(f"    {line}")
+            print()
 
-    except Exception as e:
-        print(error(f"Fatal: {str(e)}"))
-        import traceback
-        traceback.print_exc()
-        return 1
+    return 0
@@ -1,162 +1,200 @@
 """merge command implementation"""
 
+import sys
 from ..core.repository import find_repository
 from ..core.objects import (
-    get_commit_tree, find_common_ancestor, Commit, write_object,
-    create_tree_from_tracks, Track
+    get_commit_tree, find_common_ancestor, Commit, Tree,
+    read_object, write_object
 )
-from ..utils.colors import error, success, info, bold
+from ..utils.colors import error, success, info
+from ..utils.errors import spgit_command
 
 
+@spgit_command
 def merge_command(args):
     """Merge branches."""
-    try:
-        repo = find_repository()
-        if not repo:
-            print(error("Fatal: not a spgit repository"))
-            return 1
-
-        branch_name = args.branch
-
-        # Get current branch
-        current_branch = repo.get_current_branch()
-        if not current_branch:
-            print(error("Fatal: cannot merge in detached HEAD state"))
-            return 1
-
-        # Get branch to merge
-        if not repo.branch_exists(branch_name):
-            print(error(f"Branch '{branch_name}' not found"))
-            return 1
-
-        # Get commits
-        current_commit = repo.get_head_commit()
-        merge_commit = repo.get_branch_commit(branch_name)
-
-        if not current_commit or not merge_commit:
-            print(error("Fatal: invalid commit"))
-            return 1
-
-        # Check if already up to date
-        if current_commit == merge_commit:
-            print(info("Already up to date."))
-            return 0
-
-        # Find common ancestor
-        base_commit = find_common_ancestor(repo, current_commit, merge_commit)
-
-        # Check for fast-forward
-        if base_commit == current_commit:
-            # Fast-forward merge
-            print(info(f"Updating {current_commit[:7]}..{merge_commit[:7]}"))
-            print(info("Fast-forward"))
-
-            repo._update_ref(f"refs/heads/{current_branch}", merge_commit)
-            repo._update_reflog(
-                f"refs/heads/{current_branch}",
-                current_commit,
-                merge_commit,
-                f"merge {branch_name}: Fast-forward"
-            )
-
-            # Update index
-            tracks = get_commit_tree(repo, merge_commit)
-            tree = create_tree_from_tracks(repo, list(tracks.values()))
-            repo.update_index({
-                "tree": tree,
-                "tracks": {uri: track.to_dict() for uri, track in tracks.items()}
-            })
-
-            print(success(f"Merged {branch_name} into {current_branch}"))
-            return 0
-
-        # Three-way merge
-        print(info(f"Merge made by the 'three-way' strategy."))
-
-        base_tracks = get_commit_tree(repo, base_commit) if base_commit else {}
-        current_tracks = get_commit_tree(repo, current_commit)
-        merge_tracks = get_commit_tree(repo, merge_commit)
-
-        # Get merge strategy
-        strategy = args.strategy if hasattr(args, 'strategy') and args.strategy else 'union'
-
-        merged_tracks = _merge_tracks(base_tracks, current_tracks, merge_tracks, strategy)
-
-        # Check for conflicts
-        if merged_tracks is None:
-            print(error("Automatic merge failed; fix conflicts and then commit the result."))
-            return 1
-
-        # Create merge commit
-        tree = create_tree_from_tracks(repo, list(merged_tracks.values()))
-
-        commit = Commit(
-            tree=tree,
-            parent=None,
-            parents=[current_commit, merge_commit],
-            message=f"Merge branch '{branch_name}' into {current_branch}",
-            author="spgit",
-            committer="spgit"
-        )
-        commit_hash = write_object(repo, commit)
+    repo = find_repository()
+    if not repo:
+        print(error("Fatal: not a spgit repository"))
+        return 1
+
+    if args.stdin:
+        return _merge_stdin(repo, args.strategy or 'union')
+
+    branch_name = args.branch
+    if not branch_name:
+        print(error("Fatal: no branch to merge"))
+        return 1
+
+    # Get current branch
+    current_branch = repo.get_current_branch()
+    if not current_branch:
+        print(error("Fatal: cannot merge in detached HEAD state"))
+        return 1
+
+    # Get branch to merge
+    if not repo.branch_exists(branch_name):
+        print(error(f"Branch '{branch_name}' not found"))
+        return 1
 
-        # Update branch
-        repo._update_ref(f"refs/heads/{current_branch}", commit_hash)
+    # Get commits
+    current_commit = repo.get_head_commit()
+    merge_commit = repo.get_branch_commit(branch_name)
+
+    if not current_commit or not merge_commit:
+        print(error("Fatal: invalid commit"))
+        return 1
+
+    # Check if already up to date
+    if current_commit == merge_commit:
+        print(info("Already up to date."))
+        return 0
+
+    # Find common ancestor
+    base_commit = find_common_ancestor(repo, current_commit, merge_commit)
+
+    # Check for fast-forward
+    if base_commit == current_commit:
+        # Fast-forward merge
+        print(info(f"Updating {current_commit[:7]}..{merge_commit[:7]}"))
+        print(info("Fast-forward"))
+
+        repo._update_ref(f"refs/heads/{current_branch}", merge_commit)
         repo._update_reflog(
             f"refs/heads/{current_branch}",
             current_commit,
-            commit_hash,
-            f"merge {branch_name}: Merge made by the 'three-way' strategy."
+            merge_commit,
+            f"merge {branch_name}: Fast-forward"
         )
 
         # Update index
-        repo.update_index({
-            "tree": tree,
-            "tracks": {uri: track.to_dict() for uri, track in merged_tracks.items()}
-        })
+        repo.update_index_from_commit(merge_commit)
 
         print(success(f"Merged {branch_name} into {current_branch}"))
         return 0
 
-    except Exception as e:
-        print(error(f"Fatal: {str(e)}"))
-        import traceback
-        traceback.print_exc()
+    # Three-way merge
+    print(info(f"Merge made by the 'three-way' strategy."))
+
+    current_tracks = get_commit_tree(repo, current_commit)
+    merge_tracks = get_commit_tree(repo, merge_commit)
+
+    # Get merge strategy
+    strategy = args.strategy or 'union'
+
+    merged_tracks = _merge_tracks(current_tracks, merge_tracks, strategy)
+
+    # Check for conflicts
+    if merged_tracks is None:
+        print(error("Automatic merge failed; fix conflicts and then commit the result."))
         return 1
 
+    # Create merge commit; every merged track already has a blob in one of
+    # the parents, so the same merge over their trees gives the new tree
+    tree = _merge_tracks(
+        dict(read_object(repo, current_commit).tree),
+        read_object(repo, merge_commit).tree,
+        strategy
+    )
+
+    commit = Commit(
+        tree=tree,
+        parent=None,
+        parents=[current_commit, merge_commit],
+        message=f"Merge branch '{branch_name}' into {current_branch}",
+        author="spgit",
+        committer="spgit"
+    )
+    commit_hash = write_object(repo, commit)
+
+    # Update branch
+    repo._update_ref(f"refs/heads/{current_branch}", commit_hash)
+    repo._update_reflog(
+        f"refs/heads/{current_branch}",
+        current_commit,
+        commit_hash,
+        f"merge {branch_name}: Merge made by the 'three-way' strategy."
+    )
+
+    # Update index
+    repo.update_index({
+        "tree": tree,
+        "tracks": merged_tracks
+    })
+
+    print(success(f"Merged {branch_name} into {current_branch}"))
+    return 0
+
+
+def _merge_stdin(repo, strategy):
+    """
+    Merge each "branch1 branch2" pair read from stdin.
+
+    Prints "<base> <tree>" per pair, where base is the merge base a real
+    merge would use and tree is the hash of a tree object holding the
+    merged {uri: blob hash} mapping ("-" when there is no base, "conflict"
+    when the merge fails). Refs, HEAD and the index are left alone, but the
+    merged tree objects are written. Commits read are kept for the whole
+    batch, and merge bases come from the commit graph, so pairs that share
+    history are cheap.
 
-def _merge_tracks(base_tracks, current_tracks, merge_tracks, strategy='union'):
+    Returns 0, or 1 if any pair could not be resolved
+    """
+    cache = {}
+    status = 0
+
+    for line in sys.stdin:
+        names = line.split()
+        if not names:
+            continue
+        if len(names) != 2 or not all(repo.branch_exists(name) for name in names):
+            print(error(f"Invalid merge pair: {line.strip()}"))
+            status = 1
+            continue
+
+        commits = [repo.get_branch_commit(name) for name in names]
+        base = find_common_ancestor(repo, commits[0], commits[1])
+
+        trees = []
+        for commit in commits:
+            if commit not in cache:
+                cache[commit] = read_object(repo, commit)
+            trees.append(cache[commit].tree)
+
+        merged = _merge_tracks(dict(trees[0]), trees[1], strategy)
+        result = "conflict" if merged is None else write_object(repo, Tree(merged))
+        print(f"{base or '-'} {result}")
+
+    return status
+
+
+def _merge_tracks(current_tracks, merge_tracks, strategy='union'):
     """
     Merge track sets using specified strategy.
 
+    None of the strategies depend on the merge base, so only the two tips
+    are needed. The result is built in place from current_tracks (which
+    the caller must not reuse) and only the differing entries are touched.
+
     Returns merged tracks or None if conflicts
     """
-    if strategy == 'union':
-        # Union: combine all unique tracks
-        merged = {}
-        merged.update(current_tracks)
-        merged.update(merge_tracks)
-        return merged
-
-    elif strategy == 'append':
+    if strategy == 'append':
         # Append: add merge tracks to end of current
-        merged = {}
-        merged.update(current_tracks)
+        merged = current_tracks
         for uri, track in merge_tracks.items():
             if uri not in merged:
                 merged[uri] = track
         return merged
 
     elif strategy == 'intersection':
-        # Intersection: only keep tracks in both
-        merged = {}
-        for uri in current_tracks.keys() & merge_tracks.keys():
-            merged[uri] = current_tracks[uri]
-        return merged
+        # Intersection: only keep tracks in both, probing the larger side
+        # with the keys of the smaller one
+        smaller, larger = sorted((current_tracks, merge_tracks), key=len)
+        return {uri: current_tracks[uri] for uri in smaller if uri in larger}
 
     else:
-        # Default to union
-        merged = {}
-        merged.update(current_tracks)
-        merged.update(merge_tracks)
+        # Union (the default): combine all unique tracks, merge side wins
+        merged = current_tracks
+        if merge_tracks:
+            merged.update(merge_tracks)
         return merged
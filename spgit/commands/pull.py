@@ -1,75 +1,56 @@
 """pull command implementation"""
 
 from ..core.repository import find_repository
-from ..core.spotify import get_spotify_client
-from ..core.objects import create_tree_from_tracks, Commit, write_object
+from ..core.objects import create_tree_from_track_dicts, read_object
 from ..utils.colors import error, success, info
+from ..utils.errors import spgit_command
 
 
+@spgit_command
 def pull_command(args):
     """Fetch from and integrate with Spotify playlist."""
-    try:
-        repo = find_repository()
-        if not repo:
-            print(error("Fatal: not a spgit repository"))
-            return 1
-
-        remote = args.remote if hasattr(args, 'remote') and args.remote else "origin"
-
-        # Get remote URL
-        remote_url = repo.get_remote_url(remote)
-        if not remote_url:
-            print(error(f"Remote '{remote}' not found"))
-            return 1
-
-        # Get current branch
-        current_branch = repo.get_current_branch()
-        if not current_branch:
-            print(error("Fatal: cannot pull in detached HEAD state"))
-            return 1
+    repo = find_repository()
+    if not repo:
+        print(error("Fatal: not a spgit repository"))
+        return 1
 
-        print(info(f"Pulling from {remote}..."))
+    remote = args.remote or "origin"
 
-        # Fetch from Spotify
-        sp = get_spotify_client(repo)
-        playlist_id = sp.get_playlist_id(remote_url)
-        tracks = sp.get_playlist_tracks(playlist_id)
+    # Get remote URL
+    remote_url = repo.get_remote_url(remote)
+    if not remote_url:
+        print(error(f"Remote '{remote}' not found"))
+        return 1
 
-        print(info(f"Received {len(tracks)} tracks"))
+    # Get current branch
+    current_branch = repo.get_current_branch()
+    if not current_branch:
+        print(error("Fatal: cannot pull in detached HEAD state"))
+        return 1
 
-        # Create tree and commit
-        tree = create_tree_from_tracks(repo, tracks)
-        head_commit = repo.get_head_commit()
+    print(info(f"Pulling from {remote}..."))
 
-        commit = Commit(
-            tree=tree,
-            parent=head_commit,
-            message=f"Pull from {remote}",
-            author="spgit",
-            committer="spgit"
-        )
-        commit_hash = write_object(repo, commit)
+    # Fetch from Spotify
+    from ..core.spotify import get_spotify_client
+    sp = get_spotify_client(repo)
+    playlist_id = sp.get_playlist_id(remote_url)
+    tracks = sp.get_playlist_tracks_raw(playlist_id)
 
-        # Update branch
-        repo._update_ref(f"refs/heads/{current_branch}", commit_hash)
-        repo._update_reflog(
-            f"refs/heads/{current_branch}",
-            head_commit,
-            commit_hash,
-            f"pull {remote}: Fast-forward"
-        )
+    print(info(f"Received {len(tracks)} tracks"))
 
-        # Update index
-        repo.update_index({
-            "tree": tree,
-            "tracks": {track.uri: track.to_dict() for track in tracks}
-        })
+    # Create tree and commit
+    tree = create_tree_from_track_dicts(repo, tracks.values())
+    head_commit = repo.get_head_commit()
 
-        print(success(f"Successfully pulled from {remote}"))
+    if head_commit and read_object(repo, head_commit).tree == tree:
+        print(info("Already up to date."))
         return 0
 
-    except Exception as e:
-        print(error(f"Fatal: {str(e)}"))
-        import traceback
-        traceback.print_exc()
-        return 1
+    # Commit the fetched state on the current branch and update the index
+    repo.commit_tracks(
+        current_branch, tree, f"Pull from {remote}", parent=head_commit,
+        reflog_message=f"pull {remote}: Fast-forward", tracks=tracks
+    )
+
+    print(success(f"Successfully pulled from {remote}"))
+    return 0
@@ -1,55 +1,61 @@
 """push command implementation"""
 
 from ..core.repository import find_repository
-from ..core.spotify import get_spotify_client
-from ..core.objects import get_commit_tree
+from ..core.objects import get_commit_tree, read_object
 from ..utils.colors import error, success, info
+from ..utils.errors import spgit_command
 
 
+@spgit_command
 def push_command(args):
     """Update remote Spotify playlist."""
-    try:
-        repo = find_repository()
-        if not repo:
-            print(error("Fatal: not a spgit repository"))
-            return 1
-
-        remote = args.remote if hasattr(args, 'remote') and args.remote else "origin"
-
-        # Get remote URL
-        remote_url = repo.get_remote_url(remote)
-        if not remote_url:
-            print(error(f"Remote '{remote}' not found"))
-            return 1
-
-        # Get current branch
-        current_branch = repo.get_current_branch()
-        if not current_branch:
-            print(error("Fatal: cannot push from detached HEAD state"))
-            return 1
-
-        head_commit = repo.get_head_commit()
-        if not head_commit:
-            print(error("Fatal: no commits to push"))
-            return 1
-
-        print(info(f"Pushing to {remote}..."))
-
-        # Get tracks from HEAD commit
-        tracks = get_commit_tree(repo, head_commit)
-        track_list = list(tracks.values())
-
-        # Push to Spotify
-        sp = get_spotify_client(repo)
-        playlist_id = sp.get_playlist_id(remote_url)
-        sp.update_playlist(playlist_id, track_list)
-
-        print(info(f"Pushed {len(track_list)} tracks"))
-        print(success(f"Successfully pushed to {remote}"))
-        return 0
+    repo = find_repository()
+    if not repo:
+        print(error("Fatal: not a spgit repository"))
+        return 1
+
+    remote = args.remote or "origin"
+
+    # Get remote URL
+    remote_url = repo.get_remote_url(remote)
+    if not remote_url:
+        print(error(f"Remote '{remote}' not found"))
+        return 1
+
+    # Get current branch
+    current_branch = repo.get_current_branch()
+    if not current_branch:
+        print(error("Fatal: cannot push from detached HEAD state"))
+        return 1
 
-    except Exception as e:
-        print(error(f"Fatal: {str(e)}"))
-        import traceback
-        traceback.print_exc()
+    head_commit = repo.get_head_commit()
+    if not head_commit:
+        print(error("Fatal: no commits to push"))
         return 1
+
+    # Nothing to send if the remote already holds what HEAD has
+    remote_commit = repo.get_remote_commit(remote)
+    if remote_commit and read_object(repo, remote_commit).tree == read_object(repo, head_commit).tree:
+        print(info("Everything up-to-date"))
+        return 0
+
+    print(info(f"Pushing to {remote}..."))
+
+    # Get tracks from HEAD commit
+    tracks = get_commit_tree(repo, head_commit)
+    track_list = list(tracks.values())
+
+    # Push to Spotify, sending only the changes
+    from ..core.spotify import get_spotify_client
+    sp = get_spotify_client(repo)
+    playlist_id = sp.get_playlist_id(remote_url)
+    added, removed = sp.sync_playlist(playlist_id, track_list)
+
+    # Remember what the remote now holds
+    ref = f"refs/remotes/{remote}/main"
+    repo._update_ref(ref, head_commit)
+    repo._update_reflog(ref, remote_commit, head_commit, "update by push")
+
+    print(info(f"Pushed {len(track_list)} tracks ({added} added, {removed} removed)"))
+    print(success(f"Successfully pushed to {remote}"))
+    return 0
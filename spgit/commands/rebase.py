@@ -1,88 +1,67 @@
 """rebase command implementation"""
 
 from ..core.repository import find_repository
-from ..core.objects import read_object, Commit as CommitObj, write_object, Commit, get_commit_history
+from ..core.objects import write_object, Commit, find_fork_point
 from ..utils.colors import error, success, info
+from ..utils.errors import spgit_command
 
 
+@spgit_command
 def rebase_command(args):
     """Reapply commits on top of another branch."""
-    try:
-        repo = find_repository()
-        if not repo:
-            print(error("Fatal: not a spgit repository"))
-            return 1
-
-        target_branch = args.branch
-
-        # Get target branch commit
-        if not repo.branch_exists(target_branch):
-            print(error(f"Branch '{target_branch}' not found"))
-            return 1
-
-        target_commit = repo.get_branch_commit(target_branch)
-        current_branch = repo.get_current_branch()
-
-        if not current_branch:
-            print(error("Fatal: cannot rebase in detached HEAD state"))
-            return 1
+    repo = find_repository()
+    if not repo:
+        print(error("Fatal: not a spgit repository"))
+        return 1
 
-        current_commit = repo.get_head_commit()
+    target_branch = args.branch
 
-        print(info(f"Rebasing {current_branch} onto {target_branch}..."))
+    # Get target branch commit
+    if not repo.branch_exists(target_branch):
+        print(error(f"Branch '{target_branch}' not found"))
+        return 1
 
-        # Get commits to reapply
-        current_history = set(get_commit_history(repo, current_commit))
-        target_history = set(get_commit_history(repo, target_commit))
+    target_commit = repo.get_branch_commit(target_branch)
+    current_branch = repo.get_current_branch()
 
-        commits_to_reapply = []
-        commit = current_commit
+    if not current_branch:
+        print(error("Fatal: cannot rebase in detached HEAD state"))
+        return 1
 
-        while commit and commit not in target_history:
-            commits_to_reapply.append(commit)
-            try:
-                commit_obj = read_object(repo, commit)
-                if isinstance(commit_obj, CommitObj) and commit_obj.parents:
-                    commit = commit_obj.parents[0]
-                else:
-                    break
-            except ValueError:
-                break
+    current_commit = repo.get_head_commit()
 
-        commits_to_reapply.reverse()
+    print(info(f"Rebasing {current_branch} onto {target_branch}..."))
 
-        # Reapply commits
-        new_head = target_commit
+    # Get commits to reapply
+    commit_cache = {}
+    _, commits_to_reapply = find_fork_point(repo, current_commit, target_commit, commit_cache)
 
-        for old_commit in commits_to_reapply:
-            old_commit_obj = read_object(repo, old_commit)
-            if not isinstance(old_commit_obj, CommitObj):
-                continue
+    # Reapply commits
+    new_head = target_commit
 
-            # Create new commit
-            new_commit = Commit(
-                tree=old_commit_obj.tree,
-                parent=new_head,
-                message=old_commit_obj.message,
-                author=old_commit_obj.author,
-                committer="spgit"
-            )
-            new_head = write_object(repo, new_commit)
+    for old_commit in commits_to_reapply:
+        old_commit_obj = commit_cache[old_commit]
+        if not isinstance(old_commit_obj, Commit):
+            continue
 
-        # Update branch
-        repo._update_ref(f"refs/heads/{current_branch}", new_head)
-        repo._update_reflog(
-            f"refs/heads/{current_branch}",
-            current_commit,
-            new_head,
-            f"rebase: onto {target_branch}"
+        # Create new commit
+        new_commit = Commit(
+            tree=old_commit_obj.tree,
+            parent=new_head,
+            message=old_commit_obj.message,
+            author=old_commit_obj.author,
+            committer="spgit"
         )
-
-        print(success(f"Successfully rebased {current_branch} onto {target_branch}"))
-        return 0
-
-    except Exception as e:
-        print(error(f"Fatal: {str(e)}"))
-        import traceback
-        traceback.print_exc()
-        return 1
+        new_head = write_object(repo, new_commit)
+
+    # Update branch
+    repo._update_ref(f"refs/heads/{current_branch}", new_head)
+    repo._update_reflog(
+        f"refs/heads/{current_branch}",
+        current_commit,
+        new_head,
+        f"rebase: onto {target_branch}"
+    )
+
+    print(success(f"Successfully rebased {current_branch} onto {target_branch}"))
+    return 0
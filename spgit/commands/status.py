@@ -1,75 +1,70 @@
 """status command implementation"""
 
+import sys
 from ..core.repository import find_repository
-from ..core.objects import read_object, Commit, get_commit_tree
-from ..utils.colors import success, error, branch, added, removed, modified, untracked, bold
+from ..core.objects import read_object
+from ..utils.colors import error, branch, added, removed, modified, bold
+from ..utils.errors import spgit_command
 
 
+@spgit_command
 def status_command(args):
     """Show working tree status."""
-    try:
-        repo = find_repository()
-        if not repo:
-            print(error("Fatal: not a spgit repository"))
-            return 1
-
-        # Get current branch
-        current_branch = repo.get_current_branch()
-        head_commit = repo.get_head_commit()
+    repo = find_repository()
+    if not repo:
+        print(error("Fatal: not a spgit repository"))
+        return 1
 
-        # Show branch info
-        if current_branch:
-            print(f"On branch {branch(current_branch)}")
-        else:
-            print(f"HEAD detached at {head_commit[:7] if head_commit else 'unknown'}")
+    # Get current branch
+    current_branch = repo.get_current_branch()
+    head_commit = repo.get_head_commit()
 
-        # Get HEAD commit tracks
-        head_tracks = {}
-        if head_commit:
-            head_tracks = get_commit_tree(repo, head_commit)
+    # Show branch info
+    if current_branch:
+        print(f"On branch {branch(current_branch)}")
+    else:
+        print(f"HEAD detached at {head_commit[:7] if head_commit else 'unknown'}")
 
-        # Get index (staged) tracks
-        index = repo.read_index()
-        staged_tracks = {}
-        if "tracks" in index:
-            from ..core.objects import Track
-            staged_tracks = {uri: Track.from_dict(data) for uri, data in index["tracks"].items()}
+    # Compare the HEAD and index trees ({uri: blob hash}); equal hashes
+    # mean equal tracks, so no track data is loaded to find the changes
+    head_tree = {}
+    if head_commit:
+        head_tree = read_object(repo, head_commit).tree
 
-        # Compare HEAD to index
-        staged_added = set(staged_tracks.keys()) - set(head_tracks.keys())
-        staged_removed = set(head_tracks.keys()) - set(staged_tracks.keys())
-        staged_modified = {uri for uri in staged_tracks.keys() & head_tracks.keys()
-                          if staged_tracks[uri] != head_tracks[uri]}
+    index = repo.read_index()
+    staged_tree = index.get("tree", {})
+    staged_tracks = index.get("tracks", {})
 
-        has_staged = staged_added or staged_removed or staged_modified
+    staged_added = staged_tree.keys() - head_tree.keys()
+    staged_removed = head_tree.keys() - staged_tree.keys()
+    staged_modified = {uri for uri in staged_tree.keys() & head_tree.keys()
+                       if staged_tree[uri] != head_tree[uri]}
 
-        # Show staged changes
-        if has_staged:
-            print()
-            print(bold("Changes to be committed:"))
-            print(f"  (use \"spgit reset HEAD <track>...\" to unstage)")
-            print()
-            for uri in sorted(staged_added):
-                track = staged_tracks[uri]
-                print(f"  {added('new track:')}   {track.name} - {track.artist}")
-            for uri in sorted(staged_removed):
-                track = head_tracks[uri]
-                print(f"  {removed('deleted:')}    {track.name} - {track.artist}")
-            for uri in sorted(staged_modified):
-                track = staged_tracks[uri]
-                print(f"  {modified('modified:')}   {track.name} - {track.artist}")
+    has_staged = staged_added or staged_removed or staged_modified
 
-        if not has_staged:
-            print()
-            if head_commit:
-                print("nothing to commit, working tree clean")
-            else:
-                print("No commits yet")
+    # Show staged changes
+    if has_staged:
+        print()
+        print(bold("Changes to be committed:"))
+        print(f"  (use \"spgit reset HEAD <track>...\" to unstage)")
+        print()
+        out = []
+        for uri in sorted(staged_added):
+            track = staged_tracks[uri]
+            out.append(f"  {added('new track:')}   {track['name']} - {track['artist']}")
+        for uri in sorted(staged_removed):
+            track = read_object(repo, head_tree[uri]).track
+            out.append(f"  {removed('deleted:')}    {track.name} - {track.artist}")
+        for uri in sorted(staged_modified):
+            track = staged_tracks[uri]
+            out.append(f"  {modified('modified:')}   {track['name']} - {track['artist']}")
+        sys.stdout.write("\n".join(out) + "\n")
 
-        return 0
+    if not has_staged:
+        print()
+        if head_commit:
+            print("nothing to commit, working tree clean")
+        else:
+            print("No commits yet")
 
-    except Exception as e:
-        print(error(f"Fatal: {str(e)}"))
-        import traceback
-        traceback.print_exc()
-        return 1
+    return 0
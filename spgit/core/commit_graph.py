@@ -0,0 +1,142 @@
+"""
+Commit-graph cache for spgit.
+
+Stores each known commit's generation number and parents in
+.spgit/commit-graph so merge-base queries can stop early instead of
+expanding both histories in full.
+"""
+
+import heapq
+import os
+from typing import Dict, List, Optional, Tuple
+
+from ..utils.jsonio import read_json, write_json
+from .objects import read_commit_parents
+
+# {commit hash: [generation number, [parent hashes]]}; roots have generation 1
+CommitGraph = Dict[str, list]
+
+_graph_cache: Dict[str, Tuple[int, CommitGraph]] = {}
+
+
+def load_commit_graph(repo) -> CommitGraph:
+    """
+    Load the commit graph, reusing the parsed copy while the file is unchanged.
+
+    Args:
+        repo: Repository instance
+
+    Returns:
+        Commit graph mapping (empty if none has been written yet)
+    """
+    path = repo.commit_graph_path
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return {}
+
+    key = str(path)
+    cached = _graph_cache.get(key)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, read_json(path))
+        _graph_cache[key] = cached
+    return cached[1]
+
+
+def save_commit_graph(repo, graph: CommitGraph) -> None:
+    """
+    Write the commit graph.
+
+    Args:
+        repo: Repository instance
+        graph: Commit graph mapping
+    """
+    path = repo.commit_graph_path
+    write_json(path, graph)
+    _graph_cache[str(path)] = (os.stat(path).st_mtime_ns, graph)
+
+
+def extend_commit_graph(repo, graph: CommitGraph, commits: List[str]) -> bool:
+    """
+    Add the given commits and their missing ancestors to the graph.
+
+    Only commits not already in the graph are read, so keeping the graph
+    current costs one object read per new commit.
+
+    Args:
+        repo: Repository instance
+        graph: Commit graph mapping, updated in place
+        commits: Commit hashes to add
+
+    Returns:
+        True if any commit was added
+    """
+    added = False
+    stack = [commit for commit in commits if commit and commit not in graph]
+    parents_of = {}
+
+    while stack:
+        commit = stack[-1]
+        if commit in graph:
+            stack.pop()
+            continue
+
+        if commit not in parents_of:
+            try:
+                parents_of[commit] = read_commit_parents(repo, commit)
+            except ValueError:
+                # Object not found, treat as a root
+                parents_of[commit] = []
+
+        missing = [parent for parent in parents_of[commit] if parent not in graph]
+        if missing:
+            stack.extend(missing)
+            continue
+
+        # All parents are known: the generation is one more than the highest
+        parents = parents_of.pop(commit)
+        generation = 1 + max((graph[parent][0] for parent in parents), default=0)
+        graph[commit] = [generation, parents]
+        added = True
+        stack.pop()
+
+    return added
+
+
+def merge_base(graph: CommitGraph, commit1: str, commit2: str) -> Optional[str]:
+    """
+    Find a best common ancestor using generation numbers.
+
+    Commits are expanded highest generation first, so every descendant of
+    a commit is seen before it; the first commit reached from both sides
+    is therefore not an ancestor of any other common ancestor.
+
+    Args:
+        graph: Commit graph containing both commits and their ancestors
+        commit1: First commit hash
+        commit2: Second commit hash
+
+    Returns:
+        Common ancestor commit hash, or None if the histories are unrelated
+    """
+    if commit1 == commit2:
+        return commit1
+
+    flags = {commit1: 1, commit2: 2}
+    heap = [(-graph[commit1][0], commit1), (-graph[commit2][0], commit2)]
+    heapq.heapify(heap)
+
+    while heap:
+        _, commit = heapq.heappop(heap)
+        side = flags[commit]
+        if side == 3:
+            return commit
+
+        for parent in graph[commit][1]:
+            seen = flags.get(parent, 0)
+            if seen | side != seen:
+                if not seen:
+                    heapq.heappush(heap, (-graph[parent][0], parent))
+                flags[parent] = seen | side
+
+    return None
@@ -3,13 +3,56 @@ Object database implementation for spgit.
 Handles commits, trees, and blobs with SHA-1 hashing.
 """
 
+import os
 import hashlib
+import heapq
 import json
 import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Iterable, Iterator, Tuple
 from pathlib import Path
 
+from ..utils.jsonio import loads, read_json, write_json
+
+# Compression level for stored objects; any level reads back the same
+ZLIB_LEVEL = 1
+
+# Object IDs are SHA-1 hex digests. They are stored in refs, reflogs, trees
+# and object paths, so changing the algorithm would orphan existing repos.
+_object_hasher = hashlib.sha1
+
+
+def hash_object_data(data: bytes) -> str:
+    """
+    Compute the object ID of serialized object data.
+
+    Args:
+        data: Serialized object
+
+    Returns:
+        Hex digest identifying the object
+    """
+    return _object_hasher(data).hexdigest()
+
+# Trees with at least this many tracks compress their blobs on a thread pool
+# and store them in a single pack file instead of one file per object
+PACK_THRESHOLD = 64
+
+# Parsed objects kept per process; objects never change once written
+READ_CACHE_SIZE = 1024
+
+# Commit parent lists kept per process; they are small, so keep many
+PARENTS_CACHE_SIZE = 65536
+
+# How the parents key appears in serialized commits
+_PARENTS_KEY = b'"parents": ['
+
+# Parsed pack indexes per pack directory: {dir: (dir mtime, [(pack path, index)])}
+_pack_indexes: Dict[str, Tuple[int, List[Tuple[Path, Dict[str, List[int]]]]]] = {}
+
 
 class SpgitObject:
     """Base class for spgit objects."""
@@ -24,17 +67,24 @@ class SpgitObject:
     @classmethod
     def deserialize(cls, data: bytes):
         """Deserialize object from bytes."""
+        return cls.from_dict(loads(data))
+
+    @classmethod
+    def from_dict(cls, obj: Dict[str, Any]):
+        """Create object from its parsed serialized form."""
         raise NotImplementedError
 
     def hash(self) -> str:
         """Calculate SHA-1 hash of object."""
         data = self.serialize()
-        return hashlib.sha1(data).hexdigest()
+        return hash_object_data(data)
 
 
 class Track:
     """Represents a Spotify track."""
 
+    __slots__ = ("uri", "name", "artist", "album", "duration_ms", "added_at", "added_by")
+
     def __init__(
         self,
         uri: str,
@@ -91,19 +141,19 @@ class Blob(SpgitObject):
 
     def serialize(self) -> bytes:
         """Serialize blob to bytes."""
-        data = {
-            "type": self.obj_type,
-            "track": self.track.to_dict()
-        }
-        return json.dumps(data, sort_keys=True).encode("utf-8")
+        return _blob_data(self.track.to_dict())
 
     @classmethod
-    def deserialize(cls, data: bytes) -> "Blob":
-        """Deserialize blob from bytes."""
-        obj = json.loads(data.decode("utf-8"))
+    def from_dict(cls, obj: Dict[str, Any]) -> "Blob":
+        """Create blob from its parsed serialized form."""
         return cls(Track.from_dict(obj["track"]))
 
 
+def _blob_data(track_dict: Dict[str, Any]) -> bytes:
+    """Serialize a blob straight from a track dictionary."""
+    return json.dumps({"type": "blob", "track": track_dict}, sort_keys=True).encode("utf-8")
+
+
 class Tree(SpgitObject):
     """Represents a tree object (collection of tracks)."""
 
@@ -126,9 +176,8 @@ class Tree(SpgitObject):
         return json.dumps(data, sort_keys=True).encode("utf-8")
 
     @classmethod
-    def deserialize(cls, data: bytes) -> "Tree":
-        """Deserialize tree from bytes."""
-        obj = json.loads(data.decode("utf-8"))
+    def from_dict(cls, obj: Dict[str, Any]) -> "Tree":
+        """Create tree from its parsed serialized form."""
         return cls(obj["tracks"])
 
 
@@ -179,9 +228,8 @@ class Commit(SpgitObject):
         return json.dumps(data, sort_keys=True).encode("utf-8")
 
     @classmethod
-    def deserialize(cls, data: bytes) -> "Commit":
-        """Deserialize commit from bytes."""
-        obj = json.loads(data.decode("utf-8"))
+    def from_dict(cls, obj: Dict[str, Any]) -> "Commit":
+        """Create commit from its parsed serialized form."""
         return cls(
             tree=obj["tree"],
             parent=None,
@@ -193,6 +241,9 @@ class Commit(SpgitObject):
         )
 
 
+_OBJECT_TYPES = {"blob": Blob, "tree": Tree, "commit": Commit}
+
+
 def write_object(repo, obj: SpgitObject) -> str:
     """
     Write an object to the repository's object database.
@@ -204,28 +255,164 @@ def write_object(repo, obj: SpgitObject) -> str:
     Returns:
         SHA-1 hash of the object
     """
-    data = obj.serialize()
-    obj_hash = hashlib.sha1(data).hexdigest()
+    return _write_object_data(repo, obj.serialize())
 
-    # Store object in subdirectory based on first 2 chars of hash
-    obj_dir = repo.objects_dir / obj_hash[:2]
-    obj_dir.mkdir(exist_ok=True)
 
-    obj_path = obj_dir / obj_hash[2:]
+def _write_object_data(repo, data: bytes) -> str:
+    """
+    Hash, compress and store serialized object data as a loose object.
 
-    # Compress data with zlib
-    compressed = zlib.compress(data)
+    Nothing is compressed or written if the object is already stored.
 
-    with open(obj_path, "wb") as f:
-        f.write(compressed)
+    Args:
+        repo: Repository instance
+        data: Serialized object
 
+    Returns:
+        SHA-1 hash of the object
+    """
+    obj_hash = hash_object_data(data)
+    if not _is_stored(repo, obj_hash, _load_pack_indexes(repo.objects_dir)):
+        _write_loose(repo, obj_hash, _compress(data))
     return obj_hash
 
 
+def _write_loose(repo, obj_hash: str, compressed: bytes) -> None:
+    """
+    Store compressed object data as a loose object.
+
+    Args:
+        repo: Repository instance
+        obj_hash: SHA-1 hash of the object
+        compressed: zlib-compressed object data
+    """
+    # Store object in subdirectory based on first 2 chars of hash; the
+    # directory is only created when the first write into it fails
+    obj_dir = repo.objects_dir / obj_hash[:2]
+    obj_path = obj_dir / obj_hash[2:]
+
+    try:
+        f = open(obj_path, "wb")
+    except FileNotFoundError:
+        obj_dir.mkdir(exist_ok=True)
+        f = open(obj_path, "wb")
+    with f:
+        f.write(compressed)
+
+
+def _compress(data: bytes) -> bytes:
+    """Compress serialized object data."""
+    # Objects are small JSON, so favour speed over ratio
+    return zlib.compress(data, ZLIB_LEVEL)
+
+
+def _is_stored(repo, obj_hash: str, packs: List[Tuple[Path, Dict[str, List[int]]]]) -> bool:
+    """
+    Check whether an object is already stored, packed or loose.
+
+    Args:
+        repo: Repository instance
+        obj_hash: SHA-1 hash of the object
+        packs: Pack indexes from _load_pack_indexes
+
+    Returns:
+        True if the object exists
+    """
+    if any(obj_hash in index for _, index in packs):
+        return True
+    return os.path.exists(os.path.join(repo.objects_dir, obj_hash[:2], obj_hash[2:]))
+
+
+def _write_pack(repo, objects: List[Tuple[str, bytes]]) -> None:
+    """
+    Store compressed objects together in one pack file.
+
+    The pack is the compressed objects back to back; a JSON index next to
+    it maps each hash to its [offset, length]. The index is written last,
+    so a pack is only looked at once it is complete. Objects that are
+    already stored are left out, and no pack is written if none remain.
+
+    Args:
+        repo: Repository instance
+        objects: (object hash, compressed data) pairs
+    """
+    pack_dir = repo.objects_dir / "pack"
+    pack_dir.mkdir(exist_ok=True)
+
+    packs = _load_pack_indexes(repo.objects_dir)
+
+    index = {}
+    chunks = []
+    offset = 0
+    for obj_hash, compressed in objects:
+        if obj_hash in index or _is_stored(repo, obj_hash, packs):
+            continue
+        index[obj_hash] = [offset, len(compressed)]
+        chunks.append(compressed)
+        offset += len(compressed)
+
+    if not index:
+        return
+
+    content = b"".join(chunks)
+    name = f"pack-{hash_object_data(content)}"
+    with open(pack_dir / f"{name}.pack", "wb") as f:
+        f.write(content)
+    write_json(pack_dir / f"{name}.idx", index)
+
+    _pack_indexes.pop(str(pack_dir), None)
+
+
+def _read_packed(objects_dir: Path, obj_hash: str) -> Optional[bytes]:
+    """
+    Read an object's compressed data from the pack files.
+
+    Args:
+        objects_dir: Object store directory
+        obj_hash: SHA-1 hash of the object
+
+    Returns:
+        Compressed object data, or None if no pack holds it
+    """
+    for pack_path, index in _load_pack_indexes(objects_dir):
+        entry = index.get(obj_hash)
+        if entry is not None:
+            offset, length = entry
+            with open(pack_path, "rb") as f:
+                f.seek(offset)
+                return f.read(length)
+    return None
+
+
+def _load_pack_indexes(objects_dir: Path) -> List[Tuple[Path, Dict[str, List[int]]]]:
+    """Load the pack indexes, reusing them while the pack directory is unchanged."""
+    pack_dir = objects_dir / "pack"
+    try:
+        mtime = os.stat(pack_dir).st_mtime_ns
+    except FileNotFoundError:
+        return []
+
+    key = str(pack_dir)
+    cached = _pack_indexes.get(key)
+    if cached is None or cached[0] != mtime:
+        packs = [
+            (Path(entry.path[:-len(".idx")] + ".pack"), read_json(entry.path))
+            for entry in os.scandir(pack_dir)
+            if entry.name.endswith(".idx")
+        ]
+        cached = (mtime, packs)
+        _pack_indexes[key] = cached
+    return cached[1]
+
+
 def read_object(repo, obj_hash: str) -> SpgitObject:
     """
     Read an object from the repository's object database.
 
+    Objects are immutable once written, so each one is decompressed and
+    parsed once per process and then served from a cache. The returned
+    object is shared with later callers and must not be modified.
+
     Args:
         repo: Repository instance
         obj_hash: SHA-1 hash of the object
@@ -233,29 +420,84 @@ def read_object(repo, obj_hash: str) -> SpgitObject:
     Returns:
         Deserialized object
     """
-    obj_path = repo.objects_dir / obj_hash[:2] / obj_hash[2:]
+    return _read_object_cached(str(repo.objects_dir), obj_hash)
 
-    if not obj_path.exists():
-        raise ValueError(f"Object {obj_hash} not found")
 
-    with open(obj_path, "rb") as f:
-        compressed = f.read()
+@lru_cache(maxsize=READ_CACHE_SIZE)
+def _read_object_cached(objects_dir: str, obj_hash: str) -> SpgitObject:
+    """Read and parse an object, keyed by object store so repos never mix."""
+    obj_path = os.path.join(objects_dir, obj_hash[:2], obj_hash[2:])
 
-    # Decompress data
+    try:
+        with open(obj_path, "rb") as f:
+            compressed = f.read()
+    except FileNotFoundError:
+        compressed = _read_packed(Path(objects_dir), obj_hash)
+
+    if compressed is None:
+        raise ValueError(f"Object {obj_hash} not found")
+
+    # Decompress, then parse straight from the bytes; each buffer is dropped
+    # as soon as the next stage has it so large trees peak at two copies
     data = zlib.decompress(compressed)
+    del compressed
+    obj = loads(data)
+    del data
 
-    # Determine object type
-    obj = json.loads(data.decode("utf-8"))
-    obj_type = obj["type"]
+    obj_class = _OBJECT_TYPES.get(obj["type"])
+    if obj_class is None:
+        raise ValueError(f"Unknown object type: {obj['type']}")
+    return obj_class.from_dict(obj)
 
-    if obj_type == "blob":
-        return Blob.deserialize(data)
-    elif obj_type == "tree":
-        return Tree.deserialize(data)
-    elif obj_type == "commit":
-        return Commit.deserialize(data)
-    else:
-        raise ValueError(f"Unknown object type: {obj_type}")
+
+def read_commit_parents(repo, commit_hash: str) -> List[str]:
+    """
+    Read just the parents of a commit.
+
+    Commits are stored with sorted keys, so "parents" comes before the
+    tree; only the start of the object is decompressed, which keeps
+    history walks cheap on repos with large playlists.
+
+    Args:
+        repo: Repository instance
+        commit_hash: Commit hash
+
+    Returns:
+        Parent commit hashes (empty for root commits and non-commits)
+    """
+    return _read_commit_parents_cached(str(repo.objects_dir), commit_hash)
+
+
+@lru_cache(maxsize=PARENTS_CACHE_SIZE)
+def _read_commit_parents_cached(objects_dir: str, commit_hash: str) -> List[str]:
+    """Read a commit's parents, keyed by object store so repos never mix."""
+    obj_path = os.path.join(objects_dir, commit_hash[:2], commit_hash[2:])
+
+    try:
+        with open(obj_path, "rb") as f:
+            compressed = f.read()
+    except FileNotFoundError:
+        compressed = _read_packed(Path(objects_dir), commit_hash)
+
+    if compressed is None:
+        raise ValueError(f"Object {commit_hash} not found")
+
+    decompressor = zlib.decompressobj()
+    data = decompressor.decompress(compressed, 4096)
+    while True:
+        # Quotes inside JSON strings are escaped, so this only matches the key
+        start = data.find(_PARENTS_KEY)
+        if start != -1:
+            end = data.find(b"]", start)
+            if end != -1:
+                return loads(data[start + len(_PARENTS_KEY) - 1:end + 1])
+        if decompressor.eof or not decompressor.unconsumed_tail:
+            break
+        data += decompressor.decompress(decompressor.unconsumed_tail, 4096)
+
+    # Not a commit in the usual layout: fall back to a full read
+    obj = _read_object_cached(objects_dir, commit_hash)
+    return obj.parents if isinstance(obj, Commit) else []
 
 
 def get_commit_tree(repo, commit_hash: str) -> Dict[str, Track]:
@@ -273,8 +515,22 @@ def get_commit_tree(repo, commit_hash: str) -> Dict[str, Track]:
     if not isinstance(commit, Commit):
         raise ValueError(f"{commit_hash} is not a commit")
 
+    return get_tree_tracks(repo, commit.tree)
+
+
+def get_tree_tracks(repo, tree: Dict[str, str]) -> Dict[str, Track]:
+    """
+    Get all tracks from a tree mapping.
+
+    Args:
+        repo: Repository instance
+        tree: Dictionary mapping track URI to blob hash
+
+    Returns:
+        Dictionary mapping track URI to Track object
+    """
     tracks = {}
-    for uri, blob_hash in commit.tree.items():
+    for uri, blob_hash in tree.items():
         blob = read_object(repo, blob_hash)
         if isinstance(blob, Blob):
             tracks[uri] = blob.track
@@ -282,64 +538,146 @@ def get_commit_tree(repo, commit_hash: str) -> Dict[str, Track]:
     return tracks
 
 
-def create_tree_from_tracks(repo, tracks: List[Track]) -> Dict[str, str]:
+@lru_cache(maxsize=128)
+def _commit_tree_entries(objects_dir: str, commit_hash: str) -> Dict[str, str]:
+    """Read a commit's {uri: blob_hash} tree (cached per object store, do not mutate)."""
+    commit = _read_object_cached(objects_dir, commit_hash)
+    if not isinstance(commit, Commit):
+        raise ValueError(f"{commit_hash} is not a commit")
+    return commit.tree
+
+
+def tree_contains(repo, commit_hash: str, uri: str) -> Tuple[bool, Optional[Track]]:
+    """
+    Check whether a commit contains a track.
+
+    Only the blob of the matching track is read, not the whole tree.
+
+    Args:
+        repo: Repository instance
+        commit_hash: Commit hash
+        uri: Track URI
+
+    Returns:
+        Tuple of (found, Track if found else None)
+    """
+    blob_hash = _commit_tree_entries(str(repo.objects_dir), commit_hash).get(uri)
+    if blob_hash is None:
+        return False, None
+
+    blob = read_object(repo, blob_hash)
+    if not isinstance(blob, Blob):
+        return False, None
+    return True, blob.track
+
+
+def create_tree_from_tracks(repo, tracks: Iterable[Track]) -> Dict[str, str]:
+    """
+    Create a tree from tracks.
+
+    Args:
+        repo: Repository instance
+        tracks: Iterable of Track objects (consumed once)
+
+    Returns:
+        Dictionary mapping track URI to blob hash
+    """
+    return create_tree_from_track_dicts(repo, (track.to_dict() for track in tracks))
+
+
+def create_tree_from_track_dicts(repo, tracks: Iterable[Dict[str, Any]]) -> Dict[str, str]:
     """
-    Create a tree from a list of tracks.
+    Create a tree from track dictionaries without building Track objects.
+
+    Every blob is hashed first and only those not yet stored are
+    compressed and written, so re-syncing a playlist costs little more
+    than hashing it. Large batches of new blobs are compressed on a thread
+    pool and stored in a single pack file; small ones are written as loose
+    objects.
 
     Args:
         repo: Repository instance
-        tracks: List of Track objects
+        tracks: Iterable of dictionaries in Track.to_dict() form (consumed once)
 
     Returns:
         Dictionary mapping track URI to blob hash
     """
     tree = {}
+    missing = {}
+    packs = _load_pack_indexes(repo.objects_dir)
     for track in tracks:
-        blob = Blob(track)
-        blob_hash = write_object(repo, blob)
-        tree[track.uri] = blob_hash
+        data = _blob_data(track)
+        obj_hash = hash_object_data(data)
+        tree[track["uri"]] = obj_hash
+        if obj_hash not in missing and not _is_stored(repo, obj_hash, packs):
+            missing[obj_hash] = data
+
+    if len(missing) < PACK_THRESHOLD:
+        for obj_hash, data in missing.items():
+            _write_loose(repo, obj_hash, _compress(data))
+    else:
+        # zlib releases the GIL on its input
+        workers = min(32, os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            compressed = list(executor.map(_compress, missing.values()))
+        _write_pack(repo, list(zip(missing, compressed)))
 
     return tree
 
 
-def get_commit_history(repo, commit_hash: str) -> List[str]:
+def walk_commits_oldest_first(repo, commit_hash: str) -> Iterator[str]:
     """
-    Get the commit history from a commit.
+    Walk the commit history from a commit, oldest commit first.
 
     Args:
         repo: Repository instance
         commit_hash: Starting commit hash
 
-    Returns:
-        List of commit hashes in chronological order (oldest first)
+    Yields:
+        Commit hashes in chronological order (oldest first)
     """
-    history = []
+    history = deque()
     visited = set()
-    queue = [commit_hash]
+    queue = deque([commit_hash])
 
     while queue:
-        current = queue.pop(0)
+        current = queue.popleft()
         if current in visited:
             continue
 
         visited.add(current)
-        history.append(current)
+        history.appendleft(current)
 
         try:
-            commit = read_object(repo, current)
-            if isinstance(commit, Commit):
-                queue.extend(commit.parents)
+            queue.extend(read_commit_parents(repo, current))
         except ValueError:
             # Object not found, skip
             pass
 
-    return list(reversed(history))
+    yield from history
+
+
+def get_commit_history(repo, commit_hash: str) -> List[str]:
+    """
+    Get the commit history from a commit.
+
+    Args:
+        repo: Repository instance
+        commit_hash: Starting commit hash
+
+    Returns:
+        List of commit hashes in chronological order (oldest first)
+    """
+    return list(walk_commits_oldest_first(repo, commit_hash))
 
 
 def find_common_ancestor(repo, commit1: str, commit2: str) -> Optional[str]:
     """
     Find the common ancestor of two commits.
 
+    Uses the commit graph in .spgit/commit-graph, adding any commits it
+    does not know yet, so only new commits are read from the object store.
+
     Args:
         repo: Repository instance
         commit1: First commit hash
@@ -348,11 +686,86 @@ def find_common_ancestor(repo, commit1: str, commit2: str) -> Optional[str]:
     Returns:
         Common ancestor commit hash, or None if no common ancestor
     """
-    history1 = set(get_commit_history(repo, commit1))
-    history2 = get_commit_history(repo, commit2)
+    from .commit_graph import load_commit_graph, save_commit_graph, extend_commit_graph, merge_base
 
-    for commit in reversed(history2):
-        if commit in history1:
-            return commit
+    if not commit1 or not commit2:
+        return None
 
-    return None
+    graph = load_commit_graph(repo)
+    if extend_commit_graph(repo, graph, [commit1, commit2]):
+        save_commit_graph(repo, graph)
+
+    return merge_base(graph, commit1, commit2)
+
+
+def find_fork_point(
+    repo,
+    commit1: str,
+    commit2: str,
+    cache: Optional[Dict[str, Any]] = None
+) -> Tuple[Optional[str], List[str]]:
+    """
+    Find where commit1's first-parent line joins commit2's history.
+
+    commit1's first-parent line is walked back until it reaches a commit
+    that commit2 contains. Containment is checked with the commit graph:
+    commit2's history is expanded highest generation first and only down
+    to the generation of the commit being checked, so the walk stops near
+    the fork instead of visiting all of commit2's history.
+
+    Args:
+        repo: Repository instance
+        commit1: Commit whose own changes are wanted
+        commit2: Commit to compare against
+        cache: Optional dict of commit hash -> object, filled with the
+            commits on commit1's line as they are read
+
+    Returns:
+        Tuple of (fork point or None, commits on commit1's first-parent
+        line after the fork point, oldest first)
+    """
+    from .commit_graph import load_commit_graph, save_commit_graph, extend_commit_graph
+
+    if cache is None:
+        cache = {}
+
+    graph = load_commit_graph(repo)
+    if extend_commit_graph(repo, graph, [commit1, commit2]):
+        save_commit_graph(repo, graph)
+
+    # Commits of commit2's history found so far, and those still to expand
+    contained = set()
+    heap = []
+    if commit2:
+        contained.add(commit2)
+        heap.append((-graph[commit2][0], commit2))
+
+    fork = None
+    commits = []
+    commit = commit1
+    while commit:
+        # Every commit commit2 contains at this generation or above is
+        # found once all higher generations have been expanded
+        generation = graph[commit][0]
+        while heap and -heap[0][0] > generation:
+            _, expanded = heapq.heappop(heap)
+            for parent in graph[expanded][1]:
+                if parent not in contained:
+                    contained.add(parent)
+                    heapq.heappush(heap, (-graph[parent][0], parent))
+
+        if commit in contained:
+            fork = commit
+            break
+
+        commits.append(commit)
+        if commit not in cache:
+            try:
+                cache[commit] = read_object(repo, commit)
+            except ValueError:
+                cache[commit] = None
+        obj = cache[commit]
+        commit = obj.parents[0] if isinstance(obj, Commit) and obj.parents else None
+
+    commits.reverse()
+    return fork, commits
@@ -3,10 +3,21 @@ Core repository management for spgit.
 Implements git-like storage structure with .spgit directory.
 """
 
+import copy
 import os
-import json
+import sys
+from functools import cached_property
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
+
+from ..utils.jsonio import read_json, write_json, loads, write_json_lines, append_json_line
+
+# Leaf directories of a fresh .spgit tree; parents are created along the way
+REPO_SUBDIRS = ("objects", "refs/heads", "refs/tags", "refs/remotes", "logs/refs/heads")
+
+# HEAD contents when it points at a ref, and at a branch in particular
+SYMREF_PREFIX = "ref: "
+BRANCH_REF_PREFIX = "ref: refs/heads/"
 
 
 class Repository:
@@ -16,6 +27,8 @@ class Repository:
         """Initialize repository at the given path."""
         self.work_dir = Path(path).resolve()
         self.spgit_dir = self.work_dir / ".spgit"
+        # ((mtime_ns, size) of the config file, parsed config)
+        self._config_cache: Optional[Tuple[Tuple[int, int], Dict[str, Any]]] = None
 
     @property
     def head_path(self) -> Path:
@@ -67,10 +80,20 @@ class Repository:
         """Path to stash file."""
         return self.spgit_dir / "stash"
 
+    @property
+    def commit_graph_path(self) -> Path:
+        """Path to commit-graph file."""
+        return self.spgit_dir / "commit-graph"
+
     def exists(self) -> bool:
         """Check if repository exists."""
         return self.spgit_dir.exists() and self.spgit_dir.is_dir()
 
+    def _scaffold_dirs(self) -> None:
+        """Create the .spgit directory structure."""
+        for sub in REPO_SUBDIRS:
+            os.makedirs(self.spgit_dir / sub, exist_ok=True)
+
     def init(self, playlist_name: Optional[str] = None) -> None:
         """
         Initialize a new repository.
@@ -82,17 +105,10 @@ class Repository:
             raise ValueError(f"Repository already exists at {self.work_dir}")
 
         # Create directory structure
-        self.spgit_dir.mkdir(parents=True, exist_ok=True)
-        self.objects_dir.mkdir(exist_ok=True)
-        self.refs_dir.mkdir(exist_ok=True)
-        self.heads_dir.mkdir(exist_ok=True)
-        self.tags_dir.mkdir(exist_ok=True)
-        self.remotes_dir.mkdir(exist_ok=True)
-        self.logs_dir.mkdir(exist_ok=True)
-        (self.logs_dir / "refs" / "heads").mkdir(parents=True, exist_ok=True)
+        self._scaffold_dirs()
 
         # Initialize HEAD to point to main branch
-        self.head_path.write_text("ref: refs/heads/main")
+        self._set_head("ref: refs/heads/main")
 
         # Initialize config
         config = {
@@ -125,31 +141,58 @@ class Repository:
 
     def get_current_branch(self) -> Optional[str]:
         """Get the current branch name."""
-        if not self.head_path.exists():
-            return None
-
-        head_content = self.head_path.read_text().strip()
-        if head_content.startswith("ref: refs/heads/"):
-            return head_content[16:]  # Remove "ref: refs/heads/"
-        return None  # Detached HEAD
+        return self.current_branch
 
     def get_head_commit(self) -> Optional[str]:
         """Get the commit hash that HEAD points to."""
-        if not self.head_path.exists():
+        return self.head_commit
+
+    @cached_property
+    def _head_content(self) -> Optional[str]:
+        """Stripped contents of HEAD, None if it is missing (read once, then cached)."""
+        try:
+            # HEAD is tiny and ASCII; skip the text-mode wrapper
+            return self.head_path.read_bytes().decode().strip()
+        except FileNotFoundError:
             return None
 
-        head_content = self.head_path.read_text().strip()
+    @cached_property
+    def current_branch(self) -> Optional[str]:
+        """Current branch name, None when HEAD is detached (read once, then cached)."""
+        head_content = self._head_content
+        if head_content is not None and head_content.startswith(BRANCH_REF_PREFIX):
+            return head_content[len(BRANCH_REF_PREFIX):]
+        return None  # Detached HEAD
 
-        if head_content.startswith("ref: "):
-            # HEAD points to a branch
-            ref_path = self.spgit_dir / head_content[5:]  # Remove "ref: "
-            if ref_path.exists():
-                return ref_path.read_text().strip()
+    @cached_property
+    def head_commit(self) -> Optional[str]:
+        """Commit hash HEAD points to (read once, then cached)."""
+        head_content = self._head_content
+        if head_content is None:
             return None
+
+        if head_content.startswith(SYMREF_PREFIX):
+            # HEAD points to a branch
+            ref_path = self.spgit_dir / head_content[len(SYMREF_PREFIX):]
+            try:
+                return ref_path.read_bytes().decode().strip()
+            except FileNotFoundError:
+                return None
         else:
             # Detached HEAD
             return head_content
 
+    def _set_head(self, content: str) -> None:
+        """Point HEAD at a ref ("ref: refs/heads/<branch>") or a commit hash."""
+        self.head_path.write_text(content)
+        self._forget_head()
+
+    def _forget_head(self) -> None:
+        """Drop the cached HEAD lookups after HEAD or a ref changes."""
+        self.__dict__.pop("_head_content", None)
+        self.__dict__.pop("current_branch", None)
+        self.__dict__.pop("head_commit", None)
+
     def get_branch_commit(self, branch: str) -> Optional[str]:
         """Get the commit hash for a branch."""
         branch_path = self.heads_dir / branch
@@ -157,11 +200,19 @@ class Repository:
             return branch_path.read_text().strip()
         return None
 
+    def get_remote_commit(self, remote: str, branch: str = "main") -> Optional[str]:
+        """Get the commit last fetched from or pushed to a remote, if any."""
+        ref_path = self.remotes_dir / remote / branch
+        if ref_path.exists():
+            return ref_path.read_text().strip()
+        return None
+
     def _update_ref(self, ref: str, commit_hash: str) -> None:
         """Update a reference to point to a commit."""
         ref_path = self.spgit_dir / ref
         ref_path.parent.mkdir(parents=True, exist_ok=True)
         ref_path.write_text(commit_hash)
+        self._forget_head()
 
     def _update_reflog(self, ref: str, old_hash: Optional[str], new_hash: str, message: str) -> None:
         """Update the reflog for a reference."""
@@ -174,17 +225,85 @@ class Repository:
         with open(reflog_path, "a") as f:
             f.write(entry)
 
+    def commit_tracks(
+        self,
+        branch: str,
+        tree: Dict[str, str],
+        message: str,
+        parent: Optional[str] = None,
+        reflog_message: Optional[str] = None,
+        tracks: Optional[Dict[str, Any]] = None,
+        log_head: bool = False
+    ) -> str:
+        """
+        Record a tree as a new commit at the tip of a branch.
+
+        Writes the commit object, moves the branch ref, appends to the
+        branch reflog (and HEAD's when log_head is set) and, if tracks are
+        given, makes the index match the new commit.
+
+        Args:
+            branch: Branch to advance
+            tree: Dictionary mapping track URI to blob hash
+            message: Commit message
+            parent: Parent commit hash
+            reflog_message: Reflog entry (defaults to "commit: <message>")
+            tracks: Track data for the index, keyed by URI
+            log_head: Also append the entry to the HEAD reflog
+
+        Returns:
+            Hash of the new commit
+        """
+        from .objects import Commit
+        commit = Commit(
+            tree=tree,
+            parent=parent,
+            message=message,
+            author="spgit",
+            committer="spgit"
+        )
+        commit_hash = self._write_object(commit)
+
+        ref = f"refs/heads/{branch}"
+        reflog_message = reflog_message or f"commit: {message}"
+        self._update_ref(ref, commit_hash)
+        self._update_reflog(ref, parent, commit_hash, reflog_message)
+        if log_head:
+            self._update_reflog("HEAD", parent, commit_hash, reflog_message)
+
+        if tracks is not None:
+            self.update_index({"tree": tree, "tracks": tracks})
+
+        return commit_hash
+
     def _write_config(self, config: Dict[str, Any]) -> None:
         """Write configuration to disk."""
-        with open(self.config_path, "w") as f:
-            json.dump(config, f, indent=2)
+        write_json(self.config_path, config)
+        self._config_cache = (self._config_stamp(), copy.deepcopy(config))
 
     def read_config(self) -> Dict[str, Any]:
-        """Read configuration from disk."""
-        if not self.config_path.exists():
+        """
+        Read configuration from disk.
+
+        The parsed config is kept until the file's mtime or size changes;
+        callers get their own copy and may modify it freely.
+
+        Returns:
+            Configuration mapping (empty if there is no config file)
+        """
+        try:
+            stamp = self._config_stamp()
+        except FileNotFoundError:
             return {}
-        with open(self.config_path, "r") as f:
-            return json.load(f)
+
+        if self._config_cache is None or self._config_cache[0] != stamp:
+            self._config_cache = (stamp, read_json(self.config_path))
+        return copy.deepcopy(self._config_cache[1])
+
+    def _config_stamp(self) -> Tuple[int, int]:
+        """Return the (mtime_ns, size) of the config file."""
+        st = os.stat(self.config_path)
+        return st.st_mtime_ns, st.st_size
 
     def update_config(self, section: str, key: str, value: Any) -> None:
         """Update a configuration value."""
@@ -196,20 +315,127 @@ class Repository:
 
     def _write_index(self, index: Dict[str, Any]) -> None:
         """Write index to disk."""
-        with open(self.index_path, "w") as f:
-            json.dump(index, f, indent=2)
+        write_json(self.index_path, index)
 
     def read_index(self) -> Dict[str, Any]:
         """Read index from disk."""
         if not self.index_path.exists():
             return {}
-        with open(self.index_path, "r") as f:
-            return json.load(f)
+        return read_json(self.index_path)
 
     def update_index(self, index: Dict[str, Any]) -> None:
-        """Update the index."""
+        """Update the index. Track values may be Track objects or dicts."""
         self._write_index(index)
 
+    def update_index_from_commit(self, commit_hash: str) -> None:
+        """
+        Make the index match a commit.
+
+        The commit's stored tree is reused as is; blobs are only read to
+        fill in the track data, never rewritten. Nothing is done if the
+        index already holds that tree.
+
+        Args:
+            commit_hash: Commit to match
+        """
+        from .objects import Commit, get_tree_tracks
+        commit = self.read_object(commit_hash)
+        if not isinstance(commit, Commit):
+            raise ValueError(f"{commit_hash} is not a commit")
+
+        if self.read_index().get("tree") == commit.tree:
+            return
+
+        tracks = get_tree_tracks(self, commit.tree)
+        self.update_index({
+            "tree": commit.tree,
+            "tracks": {sys.intern(uri): track for uri, track in tracks.items()}
+        })
+
+    def read_stash(self) -> List[Dict[str, Any]]:
+        """
+        Read the stash entries, oldest first.
+
+        Returns:
+            List of stash entries ({"index": ..., "message": ...})
+        """
+        return self._load_stash()[0]
+
+    def push_stash(self, entry: Dict[str, Any]) -> None:
+        """
+        Add an entry to the end of the stash.
+
+        Args:
+            entry: Stash entry ({"index": ..., "message": ...})
+        """
+        if self._stash_is_array():
+            self._compact_stash(self.read_stash() + [entry])
+        else:
+            append_json_line(self.stash_path, {"op": "push", "entry": entry})
+
+    def drop_stash(self, position: int) -> None:
+        """
+        Remove a stash entry.
+
+        A drop is recorded by appending a tombstone line; the file is only
+        rewritten once tombstones outnumber half of the remaining entries.
+
+        Args:
+            position: Index of the entry in read_stash() order
+        """
+        entries, dropped, legacy = self._load_stash()
+        del entries[position]
+
+        if legacy or dropped + 1 > len(entries) / 2:
+            self._compact_stash(entries)
+        else:
+            append_json_line(self.stash_path, {"op": "drop", "index": position})
+
+    def _load_stash(self) -> Tuple[List[Dict[str, Any]], int, bool]:
+        """
+        Replay the stash log.
+
+        The stash is a JSON lines log of {"op": "push", "entry": ...} and
+        {"op": "drop", "index": N} records. Stashes written by older versions
+        hold a single JSON array instead; those are read as is.
+
+        Returns:
+            Tuple of (entries, number of drop records, whether the file is an array)
+        """
+        if not self.stash_path.exists():
+            return [], 0, False
+
+        with open(self.stash_path, "rb") as f:
+            data = f.read()
+
+        if data[:1] == b"[":
+            return loads(data), 0, True
+
+        entries = []
+        dropped = 0
+        for line in data.splitlines():
+            if not line.strip():
+                continue
+            record = loads(line)
+            if record["op"] == "push":
+                entries.append(record["entry"])
+            else:
+                del entries[record["index"]]
+                dropped += 1
+
+        return entries, dropped, False
+
+    def _stash_is_array(self) -> bool:
+        """Check whether the stash file is in the older single-array format."""
+        if not self.stash_path.exists():
+            return False
+        with open(self.stash_path, "rb") as f:
+            return f.read(1) == b"["
+
+    def _compact_stash(self, entries: List[Dict[str, Any]]) -> None:
+        """Rewrite the stash log with one push record per entry."""
+        write_json_lines(self.stash_path, ({"op": "push", "entry": entry} for entry in entries))
+
     def _write_object(self, obj) -> str:
         """Write an object to the object database and return its hash."""
         from .objects import write_object
@@ -221,16 +447,20 @@ class Repository:
         return read_object(self, obj_hash)
 
     def list_branches(self) -> list:
-        """List all branches."""
-        if not self.heads_dir.exists():
+        """List all branches, sorted by name."""
+        try:
+            with os.scandir(self.heads_dir) as entries:
+                return sorted(entry.name for entry in entries if entry.is_file(follow_symlinks=False))
+        except FileNotFoundError:
             return []
-        return [f.name for f in self.heads_dir.iterdir() if f.is_file()]
 
     def list_tags(self) -> list:
         """List all tags."""
-        if not self.tags_dir.exists():
+        try:
+            with os.scandir(self.tags_dir) as entries:
+                return [entry.name for entry in entries if entry.is_file(follow_symlinks=False)]
+        except FileNotFoundError:
             return []
-        return [f.name for f in self.tags_dir.iterdir() if f.is_file()]
 
     def branch_exists(self, branch: str) -> bool:
         """Check if a branch exists."""
@@ -248,6 +478,7 @@ class Repository:
         if not branch_path.exists():
             raise ValueError(f"Branch '{branch}' does not exist")
         branch_path.unlink()
+        self._forget_head()
 
     def checkout_branch(self, branch: str) -> None:
         """Switch to a branch."""
@@ -255,7 +486,7 @@ class Repository:
             raise ValueError(f"Branch '{branch}' does not exist")
 
         old_commit = self.get_head_commit()
-        self.head_path.write_text(f"ref: refs/heads/{branch}")
+        self._set_head(f"ref: refs/heads/{branch}")
         new_commit = self.get_head_commit()
 
         if new_commit:
@@ -264,7 +495,7 @@ class Repository:
     def checkout_detached(self, commit_hash: str) -> None:
         """Checkout a specific commit (detached HEAD)."""
         old_commit = self.get_head_commit()
-        self.head_path.write_text(commit_hash)
+        self._set_head(commit_hash)
         self._update_reflog("HEAD", old_commit, commit_hash, f"checkout: moving to {commit_hash[:7]}")
 
     def get_remote_url(self, remote: str = "origin") -> Optional[str]:
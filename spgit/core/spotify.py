@@ -4,25 +4,82 @@ Handles authentication and playlist operations.
 """
 
 import os
-import json
+import re
 import time
+from datetime import datetime
 from pathlib import Path
-from typing import List, Optional, Dict, Any
-from urllib.parse import urlparse, parse_qs
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Dict, Any, Tuple
 
 try:
     import spotipy
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
     from spotipy.oauth2 import SpotifyOAuth
     SPOTIPY_AVAILABLE = True
 except ImportError:
     SPOTIPY_AVAILABLE = False
 
 from .objects import Track
+from ..utils.jsonio import read_json
+
+# Playlist ID in open.spotify.com URLs and spotify:playlist: URIs
+PLAYLIST_ID_RE = re.compile(r"playlist[:/]([A-Za-z0-9]+)")
+
+# Process-wide HTTP session and clients, shared by every command and by the
+# page-fetch thread pool so connections to api.spotify.com are reused.
+_http_session = None
+_clients: Dict[Tuple[Optional[str], Optional[str]], "SpotifyClient"] = {}
+
+
+def _get_http_session():
+    """
+    Get the shared HTTP session, creating it on first use.
+
+    Returns:
+        requests.Session with a pooled, retrying HTTPS adapter
+    """
+    global _http_session
+    if _http_session is None:
+        session = requests.Session()
+        # Only idempotent calls are retried: adding items is a POST, and
+        # resending one after a lost response would add the tracks twice
+        retry = Retry(
+            total=5,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=frozenset(["GET", "PUT", "DELETE"]),
+        )
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=retry)
+        session.mount("https://", adapter)
+        _http_session = session
+    return _http_session
+
+
+def _join_artists(artists: List[Dict[str, Any]]) -> str:
+    """
+    Combine a Spotify track's artists into one display string.
+
+    Args:
+        artists: Artist objects from the Spotify API
+
+    Returns:
+        Artist names separated by ", "
+    """
+    if len(artists) == 1:
+        # Most tracks have a single artist; skip building a list to join
+        return artists[0]["name"]
+    return ", ".join([artist["name"] for artist in artists])
 
 
 class SpotifyClient:
     """Wrapper for Spotify API operations."""
 
+    # Playlist track listings are reused for this many seconds
+    TRACK_CACHE_TTL = 60.0
+    TRACK_CACHE_SIZE = 32
+
     def __init__(self, client_id: Optional[str] = None, client_secret: Optional[str] = None):
         """
         Initialize Spotify client.
@@ -45,6 +102,7 @@ class SpotifyClient:
         cache_path.parent.mkdir(parents=True, exist_ok=True)
 
         self.sp = spotipy.Spotify(
+            requests_session=_get_http_session(),
             auth_manager=SpotifyOAuth(
                 client_id=self.client_id,
                 client_secret=self.client_secret,
@@ -54,23 +112,22 @@ class SpotifyClient:
             )
         )
 
+        # playlist_id -> (fetched at, track dictionaries)
+        self._track_cache: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}
+
     def get_playlist_id(self, url_or_id: str) -> str:
         """
         Extract playlist ID from URL or return ID if already an ID.
 
         Args:
-            url_or_id: Playlist URL or ID
+            url_or_id: Playlist URL, spotify:playlist: URI, or ID
 
         Returns:
             Playlist ID
         """
-        if url_or_id.startswith("http"):
-            parsed = urlparse(url_or_id)
-            # URL format: https://open.spotify.com/playlist/PLAYLIST_ID
-            parts = parsed.path.split("/")
-            if "playlist" in parts:
-                return parts[parts.index("playlist") + 1].split("?")[0]
-        return url_or_id
+        # URL format: https://open.spotify.com/playlist/PLAYLIST_ID
+        match = PLAYLIST_ID_RE.search(url_or_id)
+        return match.group(1) if match else url_or_id
 
     def get_playlist(self, playlist_id: str) -> Dict[str, Any]:
         """
@@ -84,51 +141,191 @@ class SpotifyClient:
         """
         return self.sp.playlist(playlist_id)
 
-    def get_playlist_tracks(self, playlist_id: str) -> List[Track]:
+    def get_playlist_tracks(self, playlist_id: str, workers: int = 8) -> List[Track]:
         """
-        Get all tracks from a playlist.
+        Get all tracks from a playlist, fetching pages concurrently.
 
         Args:
             playlist_id: Playlist ID
+            workers: Maximum number of concurrent page requests
 
         Returns:
             List of Track objects
         """
-        tracks = []
-        offset = 0
+        return [Track.from_dict(data) for data in self._fetch_playlist_items(playlist_id, workers)]
+
+    def get_playlist_tracks_raw(self, playlist_id: str, workers: int = 8) -> Dict[str, Dict[str, Any]]:
+        """
+        Get all tracks from a playlist as track dictionaries keyed by URI.
+
+        The dictionaries are in Track.to_dict() form, so they can go straight
+        into the index without building Track objects. They may be shared
+        with the client's cache and should be treated as read-only.
+
+        Args:
+            playlist_id: Playlist ID
+            workers: Maximum number of concurrent page requests
+
+        Returns:
+            Dictionary mapping track URI to track dictionary
+        """
+        return {data["uri"]: data for data in self._fetch_playlist_items(playlist_id, workers)}
+
+    def get_playlist_track_uris(self, playlist_id: str, workers: int = 8) -> List[str]:
+        """
+        Get the track URIs of a playlist in playlist order.
+
+        Args:
+            playlist_id: Playlist ID
+            workers: Maximum number of concurrent page requests
+
+        Returns:
+            List of track URIs, including any duplicates
+        """
+        return [data["uri"] for data in self._fetch_playlist_items(playlist_id, workers)]
+
+    def _fetch_playlist_items(self, playlist_id: str, workers: int) -> List[Dict[str, Any]]:
+        """
+        Fetch all track dictionaries of a playlist, using the cache if fresh.
+
+        The first page reports the playlist size; the remaining pages are
+        requested from a thread pool and joined back in playlist order.
+
+        Args:
+            playlist_id: Playlist ID
+            workers: Maximum number of concurrent page requests
+
+        Returns:
+            List of track dictionaries in playlist order
+        """
+        items = self._get_cached_items(playlist_id)
+        if items is not None:
+            return items
+
         limit = 100
+        items, total = self._get_tracks_page(playlist_id, 0, limit)
+
+        offsets = range(limit, total, limit)
+        if offsets:
+            with ThreadPoolExecutor(max_workers=min(workers, len(offsets))) as executor:
+                pages = executor.map(
+                    lambda offset: self._get_tracks_page(playlist_id, offset, limit)[0],
+                    offsets
+                )
+                for page in pages:
+                    items.extend(page)
 
-        while True:
-            results = self.sp.playlist_items(
-                playlist_id,
-                offset=offset,
-                limit=limit,
-                fields="items(track(uri,name,artists,album,duration_ms),added_at,added_by.id),next"
-            )
+        self._cache_items(playlist_id, items)
+        return items
 
-            for item in results["items"]:
-                if not item["track"]:
-                    continue
+    def _get_cached_items(self, playlist_id: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get a playlist's track dictionaries from the cache if fresh enough.
 
-                track_data = item["track"]
-                artists = ", ".join([artist["name"] for artist in track_data.get("artists", [])])
+        Args:
+            playlist_id: Playlist ID
 
+        Returns:
+            Cached track dictionaries, or None on a miss
+        """
+        entry = self._track_cache.get(playlist_id)
+        if entry is None:
+            return None
+
+        fetched_at, items = entry
+        if time.monotonic() - fetched_at > self.TRACK_CACHE_TTL:
+            self._track_cache.pop(playlist_id, None)
+            return None
+        return items
+
+    def _cache_items(self, playlist_id: str, items: List[Dict[str, Any]]) -> None:
+        """
+        Remember a playlist's track dictionaries, evicting the oldest entry when full.
+
+        Args:
+            playlist_id: Playlist ID
+            items: Track dictionaries just fetched from Spotify
+        """
+        self._track_cache.pop(playlist_id, None)
+        if len(self._track_cache) >= self.TRACK_CACHE_SIZE:
+            self._track_cache.pop(next(iter(self._track_cache)), None)
+        self._track_cache[playlist_id] = (time.monotonic(), items)
+
+    def _get_tracks_page(self, playlist_id: str, offset: int,
+                         limit: int) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Fetch one page of playlist tracks.
+
+        Rate limiting (HTTP 429) is retried by the shared session, which
+        honours Retry-After.
+
+        Args:
+            playlist_id: Playlist ID
+            offset: Index of the first item to fetch
+            limit: Maximum number of items to fetch
+
+        Returns:
+            Tuple of (track dictionaries on this page, total items in the playlist)
+        """
+        results = self.sp.playlist_items(
+            playlist_id,
+            offset=offset,
+            limit=limit,
+            fields="items(track(uri,name,artists,album,duration_ms),added_at,added_by.id),total"
+        )
+
+        items = []
+        for item in results["items"]:
+            if not item["track"]:
+                continue
+
+            track_data = item["track"]
+            artists = _join_artists(track_data.get("artists", []))
+
+            # Same shape as Track.to_dict()
+            items.append({
+                "uri": track_data["uri"],
+                "name": track_data["name"],
+                "artist": artists,
+                "album": track_data.get("album", {}).get("name", "Unknown"),
+                "duration_ms": track_data.get("duration_ms", 0),
+                "added_at": item.get("added_at") or datetime.utcnow().isoformat(),
+                "added_by": item.get("added_by", {}).get("id")
+            })
+
+        return items, results["total"]
+
+    def get_tracks(self, uris: List[str]) -> List[Track]:
+        """
+        Get tracks by URI.
+
+        Args:
+            uris: Track URIs
+
+        Returns:
+            List of Track objects (URIs Spotify doesn't know are skipped)
+        """
+        tracks = []
+
+        # Look up tracks in batches of 50 (Spotify API limit)
+        for i in range(0, len(uris), 50):
+            batch = uris[i:i + 50]
+            results = self.sp.tracks(batch)
+
+            for item in results["tracks"]:
+                if not item:
+                    continue
+
+                artists = _join_artists(item["artists"])
                 track = Track(
-                    uri=track_data["uri"],
-                    name=track_data["name"],
+                    uri=item["uri"],
+                    name=item["name"],
                     artist=artists,
-                    album=track_data.get("album", {}).get("name", "Unknown"),
-                    duration_ms=track_data.get("duration_ms", 0),
-                    added_at=item.get("added_at"),
-                    added_by=item.get("added_by", {}).get("id")
+                    album=item["album"]["name"],
+                    duration_ms=item["duration_ms"]
                 )
                 tracks.append(track)
 
-            if not results["next"]:
-                break
-
-            offset += limit
-
         return tracks
 
     def create_playlist(self, name: str, description: str = "", public: bool = True) -> str:
@@ -160,43 +357,108 @@ class SpotifyClient:
             playlist_id: Playlist ID
             tracks: List of Track objects
         """
-        # Clear existing tracks
-        self.sp.playlist_replace_items(playlist_id, [])
+        self._track_cache.pop(playlist_id, None)
 
-        # Add tracks in batches of 100 (Spotify API limit)
+        # Replace with the first batch, then append the rest in order
+        # (100 URIs per request is the Spotify API limit)
         track_uris = [track.uri for track in tracks]
-        for i in range(0, len(track_uris), 100):
-            batch = track_uris[i:i + 100]
-            self.sp.playlist_add_items(playlist_id, batch)
-            time.sleep(0.1)  # Rate limiting
+        self.sp.playlist_replace_items(playlist_id, track_uris[:100])
+        for i in range(100, len(track_uris), 100):
+            self.sp.playlist_add_items(playlist_id, track_uris[i:i + 100])
 
     def add_tracks(self, playlist_id: str, tracks: List[Track]) -> None:
         """
         Add tracks to a playlist.
 
+        Batches are appended one after another so the playlist keeps the
+        given order. Adding is a POST, which the session does not retry,
+        so a batch is never sent twice.
+
         Args:
             playlist_id: Playlist ID
             tracks: List of Track objects to add
         """
-        track_uris = [track.uri for track in tracks]
-        for i in range(0, len(track_uris), 100):
-            batch = track_uris[i:i + 100]
-            self.sp.playlist_add_items(playlist_id, batch)
-            time.sleep(0.1)
+        self._add_uris(playlist_id, [track.uri for track in tracks])
 
-    def remove_tracks(self, playlist_id: str, tracks: List[Track]) -> None:
+    def remove_tracks(self, playlist_id: str, tracks: List[Track], workers: int = 4) -> None:
         """
         Remove tracks from a playlist.
 
+        Removal does not depend on order, so batches are sent concurrently.
+
         Args:
             playlist_id: Playlist ID
             tracks: List of Track objects to remove
+            workers: Maximum number of concurrent requests
+        """
+        self._remove_uris(playlist_id, [track.uri for track in tracks], workers)
+
+    def sync_playlist(self, playlist_id: str, tracks: List[Track]) -> Tuple[int, int]:
         """
+        Make a playlist match the given tracks, sending only what changed.
+
+        Missing tracks are appended and extra ones removed. When that would
+        not leave the playlist in the given order, the playlist is replaced
+        instead.
+
+        Args:
+            playlist_id: Playlist ID
+            tracks: List of Track objects the playlist should hold, in order
+
+        Returns:
+            Tuple of (tracks added, tracks removed)
+        """
+        current = self.get_playlist_track_uris(playlist_id)
         track_uris = [track.uri for track in tracks]
+        wanted = set(track_uris)
+        present = set(current)
+
+        to_remove = list(present - wanted)
+        to_add = [uri for uri in track_uris if uri not in present]
+        kept = [uri for uri in current if uri in wanted]
+
+        if kept + to_add != track_uris:
+            self.update_playlist(playlist_id, tracks)
+        else:
+            self._remove_uris(playlist_id, to_remove)
+            self._add_uris(playlist_id, to_add)
+
+        return len(to_add), len(to_remove)
+
+    def _add_uris(self, playlist_id: str, track_uris: List[str]) -> None:
+        """
+        Append track URIs to a playlist in batches of 100, keeping their order.
+
+        Args:
+            playlist_id: Playlist ID
+            track_uris: Track URIs to append
+        """
+        self._track_cache.pop(playlist_id, None)
+
         for i in range(0, len(track_uris), 100):
-            batch = track_uris[i:i + 100]
-            self.sp.playlist_remove_all_occurrences_of_items(playlist_id, batch)
-            time.sleep(0.1)
+            self.sp.playlist_add_items(playlist_id, track_uris[i:i + 100])
+
+    def _remove_uris(self, playlist_id: str, track_uris: List[str], workers: int = 4) -> None:
+        """
+        Remove track URIs from a playlist, sending batches of 100 concurrently.
+
+        Args:
+            playlist_id: Playlist ID
+            track_uris: Track URIs to remove
+            workers: Maximum number of concurrent requests
+        """
+        self._track_cache.pop(playlist_id, None)
+
+        batches = [track_uris[i:i + 100] for i in range(0, len(track_uris), 100)]
+        if not batches:
+            return
+
+        with ThreadPoolExecutor(max_workers=min(workers, len(batches))) as executor:
+            # list() surfaces any request error
+            list(executor.map(
+                lambda batch: self.sp.playlist_remove_all_occurrences_of_items(playlist_id, batch),
+                batches
+            ))
 
     def search_track(self, query: str, limit: int = 10) -> List[Track]:
         """
@@ -213,7 +475,7 @@ class SpotifyClient:
         tracks = []
 
         for item in results["tracks"]["items"]:
-            artists = ", ".join([artist["name"] for artist in item["artists"]])
+            artists = _join_artists(item["artists"])
             track = Track(
                 uri=item["uri"],
                 name=item["name"],
@@ -230,6 +492,9 @@ def get_spotify_client(repo=None) -> SpotifyClient:
     """
     Get a Spotify client instance using credentials from config.
 
+    Clients are reused for the lifetime of the process, one per set of
+    credentials.
+
     Args:
         repo: Repository instance (optional)
 
@@ -242,10 +507,9 @@ def get_spotify_client(repo=None) -> SpotifyClient:
     client_secret = None
 
     if global_config_path.exists():
-        with open(global_config_path, "r") as f:
-            config = json.load(f)
-            client_id = config.get("spotify", {}).get("client_id")
-            client_secret = config.get("spotify", {}).get("client_secret")
+        config = read_json(global_config_path)
+        client_id = config.get("spotify", {}).get("client_id")
+        client_secret = config.get("spotify", {}).get("client_secret")
 
     # Try repo config if available
     if repo and not (client_id and client_secret):
@@ -253,4 +517,8 @@ def get_spotify_client(repo=None) -> SpotifyClient:
         client_id = client_id or repo_config.get("spotify", {}).get("client_id")
         client_secret = client_secret or repo_config.get("spotify", {}).get("client_secret")
 
-    return SpotifyClient(client_id, client_secret)
+    key = (client_id, client_secret)
+    client = _clients.get(key)
+    if client is None:
+        client = _clients[key] = SpotifyClient(client_id, client_secret)
+    return client
@@ -36,8 +36,26 @@ class Colors:
     BRIGHT_WHITE = "\033[97m"
 
 
+# Whether to emit colors; decided on first use, see color_enabled()
+_color_enabled: Optional[bool] = None
+
+
 def color_enabled() -> bool:
-    """Check if color output is enabled."""
+    """Check if color output is enabled (checked once, then cached)."""
+    global _color_enabled
+    if _color_enabled is None:
+        _color_enabled = _detect_color()
+    return _color_enabled
+
+
+def reset_color_cache() -> None:
+    """Forget the cached color setting so the next check looks again."""
+    global _color_enabled
+    _color_enabled = None
+
+
+def _detect_color() -> bool:
+    """Check the terminal and environment for color support."""
     # Check if stdout is a TTY
     if not sys.stdout.isatty():
         return False
@@ -70,114 +88,131 @@ def colorize(text: str, color: str, bold: bool = False) -> str:
     Returns:
         Colorized text
     """
+    if bold:
+        prefix = _BOLD_BY_COLOR.get(color)
+        color = prefix if prefix is not None else Colors.BOLD + color
+    return _paint(text, color)
+
+
+def _paint(text: str, prefix: str) -> str:
+    """Wrap text in an escape sequence prefix and a reset, if color is enabled."""
     if not color_enabled():
         return text
-
-    prefix = f"{Colors.BOLD}{color}" if bold else color
     return f"{prefix}{text}{Colors.RESET}"
 
 
+# Bold variant of every foreground color, built once
+_BOLD_BY_COLOR = {
+    code: Colors.BOLD + code
+    for name, code in vars(Colors).items()
+    if name.isupper() and name not in ("RESET", "BOLD", "DIM")
+}
+_BOLD_RED = _BOLD_BY_COLOR[Colors.RED]
+_BOLD_GREEN = _BOLD_BY_COLOR[Colors.GREEN]
+_BOLD_YELLOW = _BOLD_BY_COLOR[Colors.YELLOW]
+_BOLD_BLUE = _BOLD_BY_COLOR[Colors.BLUE]
+_BOLD_CYAN = _BOLD_BY_COLOR[Colors.CYAN]
+_BOLD_MAGENTA = _BOLD_BY_COLOR[Colors.MAGENTA]
+
+
 # Convenience functions for common colors
 def red(text: str, bold: bool = False) -> str:
     """Red text."""
-    return colorize(text, Colors.RED, bold)
+    return _paint(text, _BOLD_RED if bold else Colors.RED)
 
 
 def green(text: str, bold: bool = False) -> str:
     """Green text."""
-    return colorize(text, Colors.GREEN, bold)
+    return _paint(text, _BOLD_GREEN if bold else Colors.GREEN)
 
 
 def yellow(text: str, bold: bool = False) -> str:
     """Yellow text."""
-    return colorize(text, Colors.YELLOW, bold)
+    return _paint(text, _BOLD_YELLOW if bold else Colors.YELLOW)
 
 
 def blue(text: str, bold: bool = False) -> str:
     """Blue text."""
-    return colorize(text, Colors.BLUE, bold)
+    return _paint(text, _BOLD_BLUE if bold else Colors.BLUE)
 
 
 def cyan(text: str, bold: bool = False) -> str:
     """Cyan text."""
-    return colorize(text, Colors.CYAN, bold)
+    return _paint(text, _BOLD_CYAN if bold else Colors.CYAN)
 
 
 def magenta(text: str, bold: bool = False) -> str:
     """Magenta text."""
-    return colorize(text, Colors.MAGENTA, bold)
+    return _paint(text, _BOLD_MAGENTA if bold else Colors.MAGENTA)
 
 
 def gray(text: str) -> str:
     """Gray text."""
-    return colorize(text, Colors.BRIGHT_BLACK)
+    return _paint(text, Colors.BRIGHT_BLACK)
 
 
 def bold(text: str) -> str:
     """Bold text."""
-    if not color_enabled():
-        return text
-    return f"{Colors.BOLD}{text}{Colors.RESET}"
+    return _paint(text, Colors.BOLD)
 
 
 def dim(text: str) -> str:
     """Dim text."""
-    if not color_enabled():
-        return text
-    return f"{Colors.DIM}{text}{Colors.RESET}"
+    return _paint(text, Colors.DIM)
 
 
-# Git-like semantic colors
+# Git-like semantic colors; these call _paint directly since they are used
+# once per line in log, status and diff output
 def added(text: str) -> str:
     """Color for added items (green)."""
-    return green(text)
+    return _paint(text, Colors.GREEN)
 
 
 def removed(text: str) -> str:
     """Color for removed items (red)."""
-    return red(text)
+    return _paint(text, Colors.RED)
 
 
 def modified(text: str) -> str:
     """Color for modified items (yellow)."""
-    return yellow(text)
+    return _paint(text, Colors.YELLOW)
 
 
 def untracked(text: str) -> str:
     """Color for untracked items (red)."""
-    return red(text)
+    return _paint(text, Colors.RED)
 
 
 def branch(text: str) -> str:
     """Color for branch names (green)."""
-    return green(text, bold=True)
+    return _paint(text, _BOLD_GREEN)
 
 
 def commit_hash(text: str) -> str:
     """Color for commit hashes (yellow)."""
-    return yellow(text)
+    return _paint(text, Colors.YELLOW)
 
 
 def header(text: str) -> str:
     """Color for headers (cyan, bold)."""
-    return cyan(text, bold=True)
+    return _paint(text, _BOLD_CYAN)
 
 
 def error(text: str) -> str:
     """Color for errors (red, bold)."""
-    return red(text, bold=True)
+    return _paint(text, _BOLD_RED)
 
 
 def warning(text: str) -> str:
     """Color for warnings (yellow, bold)."""
-    return yellow(text, bold=True)
+    return _paint(text, _BOLD_YELLOW)
 
 
 def info(text: str) -> str:
     """Color for info messages (blue)."""
-    return blue(text)
+    return _paint(text, Colors.BLUE)
 
 
 def success(text: str) -> str:
     """Color for success messages (green, bold)."""
-    return green(text, bold=True)
+    return _paint(text, _BOLD_GREEN)
@@ -0,0 +1,56 @@
+"""
+Error reporting utilities for spgit.
+"""
+
+import os
+from functools import wraps
+from typing import Callable
+
+from .colors import error
+
+
+def maybe_print_traceback() -> None:
+    """
+    Print the traceback of the exception being handled.
+
+    Set SPGIT_NO_TRACEBACK to skip it; the traceback module is then never
+    imported, which keeps scripted runs quiet and cheap on failure.
+    """
+    if os.environ.get("SPGIT_NO_TRACEBACK"):
+        return
+
+    import traceback
+    traceback.print_exc()
+
+
+def spgit_command(func: Callable = None, *, show_traceback: bool = True):
+    """
+    Wrap a command function with the standard error handling.
+
+    Failures print a "Fatal:" message (plus a traceback unless disabled) and
+    return 1; Ctrl-C returns 130.
+
+    Args:
+        func: Command function taking parsed args and returning an exit code
+        show_traceback: Whether to print the traceback on failure
+
+    Returns:
+        Wrapped command function, or a decorator when called with options
+    """
+    if func is None:
+        return lambda f: spgit_command(f, show_traceback=show_traceback)
+
+    @wraps(func)
+    def wrapper(args):
+        try:
+            return func(args)
+        except KeyboardInterrupt:
+            print("\nInterrupted")
+            return 130
+        except Exception as e:
+            print(error(f"Fatal: {str(e)}"))
+            if show_traceback:
+                maybe_print_traceback()
+            return 1
+
+    return wrapper
@@ -2,11 +2,37 @@
 Helper utilities for spgit.
 """
 
+import fnmatch
+import os
 import re
+import signal
+import sys
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Set
+from typing import Iterable, List, Optional, Pattern
 from datetime import datetime
 
+# Ignore matcher used when there are no patterns
+_MATCH_NOTHING = re.compile(r"(?!)")
+
+# Zero-padded seconds for format_duration
+_TWO_DIGITS = tuple(f"{i:02d}" for i in range(60))
+
+# Terminal width cached by get_terminal_width() until the next SIGWINCH
+_terminal_width: Optional[int] = None
+
+# (upper bound in seconds, seconds per unit, unit) for format_relative_time
+_RELATIVE_UNITS = (
+    (3600, 60, "minute"),
+    (86400, 3600, "hour"),
+    (2592000, 86400, "day"),
+    (31536000, 2592000, "month"),
+    (float("inf"), 31536000, "year"),
+)
+
+# datetime.fromisoformat accepts a trailing "Z" from Python 3.11 on
+_FROMISOFORMAT_Z = sys.version_info >= (3, 11)
+
 
 def format_duration(milliseconds: int) -> str:
     """
@@ -18,10 +44,8 @@ def format_duration(milliseconds: int) -> str:
     Returns:
         Formatted duration string
     """
-    seconds = milliseconds // 1000
-    minutes = seconds // 60
-    seconds = seconds % 60
-    return f"{minutes}:{seconds:02d}"
+    minutes, seconds = divmod(milliseconds // 1000, 60)
+    return f"{minutes}:{_TWO_DIGITS[seconds]}"
 
 
 def format_timestamp(iso_timestamp: str) -> str:
@@ -35,12 +59,20 @@ def format_timestamp(iso_timestamp: str) -> str:
         Formatted timestamp
     """
     try:
-        dt = datetime.fromisoformat(iso_timestamp.replace("Z", "+00:00"))
+        dt = _parse_timestamp(iso_timestamp)
         return dt.strftime("%Y-%m-%d %H:%M:%S")
     except Exception:
         return iso_timestamp
 
 
+@lru_cache(maxsize=1024)
+def _parse_timestamp(iso_timestamp: str) -> datetime:
+    """Parse an ISO timestamp, cached since log and blame repeat commits."""
+    if not _FROMISOFORMAT_Z and iso_timestamp.endswith("Z"):
+        iso_timestamp = iso_timestamp[:-1] + "+00:00"
+    return datetime.fromisoformat(iso_timestamp)
+
+
 def format_relative_time(iso_timestamp: str) -> str:
     """
     Format ISO timestamp to relative time (e.g., "2 hours ago").
@@ -52,32 +84,49 @@ def format_relative_time(iso_timestamp: str) -> str:
         Relative time string
     """
     try:
-        dt = datetime.fromisoformat(iso_timestamp.replace("Z", "+00:00"))
+        dt = _parse_timestamp(iso_timestamp)
         now = datetime.now(dt.tzinfo)
         delta = now - dt
 
         seconds = delta.total_seconds()
         if seconds < 60:
             return "just now"
-        elif seconds < 3600:
-            minutes = int(seconds / 60)
-            return f"{minutes} minute{'s' if minutes != 1 else ''} ago"
-        elif seconds < 86400:
-            hours = int(seconds / 3600)
-            return f"{hours} hour{'s' if hours != 1 else ''} ago"
-        elif seconds < 2592000:
-            days = int(seconds / 86400)
-            return f"{days} day{'s' if days != 1 else ''} ago"
-        elif seconds < 31536000:
-            months = int(seconds / 2592000)
-            return f"{months} month{'s' if months != 1 else ''} ago"
-        else:
-            years = int(seconds / 31536000)
-            return f"{years} year{'s' if years != 1 else ''} ago"
+        for threshold, divisor, unit in _RELATIVE_UNITS:
+            if seconds < threshold:
+                count = int(seconds // divisor)
+                return f"{count} {unit}{'s' if count != 1 else ''} ago"
     except Exception:
         return iso_timestamp
 
 
+def tail_lines(path: Path, n: int, block_size: int = 4096) -> List[str]:
+    """
+    Read the last lines of a file without loading all of it.
+
+    Args:
+        path: File to read
+        n: Number of lines to return
+        block_size: Bytes read per step, working back from the end
+
+    Returns:
+        Up to n lines, oldest first, without line endings
+    """
+    if n <= 0:
+        return []
+
+    with open(path, 'rb') as f:
+        pos = f.seek(0, os.SEEK_END)
+        data = b""
+        # One more newline than lines wanted, so the first line is whole
+        while pos > 0 and data.count(b"\n") <= n:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+
+    return [line.decode("utf-8") for line in data.splitlines()[-n:]]
+
+
 def truncate(text: str, max_length: int, suffix: str = "...") -> str:
     """
     Truncate text to maximum length.
@@ -95,62 +144,103 @@ def truncate(text: str, max_length: int, suffix: str = "...") -> str:
     return text[:max_length - len(suffix)] + suffix
 
 
-def load_ignore_patterns(repo) -> Set[str]:
+def load_ignore_patterns(repo) -> Pattern[str]:
     """
     Load ignore patterns from .spgitignore file.
 
+    The glob patterns are compiled once into a single regex, so checking
+    a URI against any number of patterns is one match call.
+
     Args:
         repo: Repository instance
 
     Returns:
-        Set of patterns to ignore
+        Compiled matcher for the ignore patterns
     """
     ignore_file = repo.work_dir / ".spgitignore"
     if not ignore_file.exists():
-        return set()
+        return _MATCH_NOTHING
 
-    patterns = set()
-    with open(ignore_file, "r") as f:
-        for line in f:
-            line = line.strip()
-            if line and not line.startswith("#"):
-                patterns.add(line)
+    lines = (line.strip() for line in ignore_file.read_text(encoding="utf-8").splitlines())
+    return compile_ignore_patterns({line for line in lines if line and line[0] != "#"})
 
-    return patterns
 
+def compile_ignore_patterns(patterns: Iterable[str]) -> Pattern[str]:
+    """
+    Compile glob patterns into one regex matching a whole URI.
 
-def should_ignore(uri: str, patterns: Set[str]) -> bool:
+    Args:
+        patterns: Glob patterns (*, ? and [...] are supported)
+
+    Returns:
+        Compiled matcher; it matches nothing if there are no patterns
+    """
+    # fnmatch.translate anchors each alternative at the end of the URI
+    regex = "|".join(fnmatch.translate(pattern) for pattern in patterns)
+    return re.compile(regex) if regex else _MATCH_NOTHING
+
+
+def should_ignore(uri: str, matcher: Pattern[str]) -> bool:
     """
     Check if a track URI should be ignored based on patterns.
 
     Args:
         uri: Track URI
-        patterns: Set of ignore patterns
+        matcher: Compiled matcher from load_ignore_patterns()
 
     Returns:
         True if should be ignored
     """
-    for pattern in patterns:
-        # Convert glob pattern to regex
-        regex_pattern = pattern.replace("*", ".*").replace("?", ".")
-        if re.match(f"^{regex_pattern}$", uri):
-            return True
-    return False
+    return matcher.match(uri) is not None
 
 
 def get_terminal_width() -> int:
     """
     Get terminal width.
 
+    The width is looked up once and kept until the terminal is resized
+    (SIGWINCH). Where no resize handler can be installed it is looked up
+    on every call.
+
     Returns:
         Terminal width in characters
     """
+    global _terminal_width
+    if _terminal_width is not None:
+        return _terminal_width
+
     try:
         import shutil
-        return shutil.get_terminal_size().columns
+        width = shutil.get_terminal_size().columns
     except Exception:
         return 80
 
+    if _watch_resize():
+        _terminal_width = width
+    return width
+
+
+def _watch_resize() -> bool:
+    """Forget the cached terminal width on SIGWINCH; False if that is not possible."""
+    if not hasattr(signal, "SIGWINCH"):
+        return False
+    try:
+        # Leave handlers installed by someone else alone
+        current = signal.getsignal(signal.SIGWINCH)
+        if current not in (signal.SIG_DFL, _forget_terminal_width):
+            return False
+        signal.signal(signal.SIGWINCH, _forget_terminal_width)
+    except ValueError:
+        # Signal handlers can only be set from the main thread
+        return False
+    return True
+
+
+def _forget_terminal_width(signum, frame) -> None:
+    """SIGWINCH handler: the next get_terminal_width() looks the width up again."""
+    global _terminal_width
+    _terminal_width = None
+
 
 def format_table(rows: List[List[str]], headers: List[str] = None) -> str:
     """
@@ -166,20 +256,18 @@ def format_table(rows: List[List[str]], headers: List[str] = None) -> str:
     if not rows:
         return ""
 
-    # Calculate column widths
+    # Stringify every cell once, then measure each column in one pass
     all_rows = [headers] + rows if headers else rows
-    col_widths = [max(len(str(row[i])) for row in all_rows) for i in range(len(all_rows[0]))]
+    cells = [[str(cell) for cell in row] for row in all_rows]
+    col_widths = [max(map(len, column)) for column in zip(*cells)]
 
     # Format rows
-    lines = []
+    lines = [
+        "  ".join(cell.ljust(width) for cell, width in zip(row, col_widths))
+        for row in cells
+    ]
     if headers:
-        header_line = "  ".join(str(headers[i]).ljust(col_widths[i]) for i in range(len(headers)))
-        lines.append(header_line)
-        lines.append("-" * len(header_line))
-
-    for row in rows:
-        line = "  ".join(str(row[i]).ljust(col_widths[i]) for i in range(len(row)))
-        lines.append(line)
+        lines.insert(1, "-" * len(lines[0]))
 
     return "\n".join(lines)
 
@@ -0,0 +1,119 @@
+"""
+JSON file helpers for spgit.
+Uses orjson when it is installed and falls back to the standard library.
+"""
+
+import os
+from pathlib import Path
+from typing import Any, Iterable, Union
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    import json
+    ORJSON_AVAILABLE = False
+
+
+def _default(obj: Any) -> Any:
+    """Serialize objects that provide to_dict(), such as Track."""
+    to_dict = getattr(obj, "to_dict", None)
+    if to_dict is None:
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+    return to_dict()
+
+
+if ORJSON_AVAILABLE:
+    def loads(data: Union[bytes, str]) -> Any:
+        """Parse JSON text."""
+        return orjson.loads(data)
+
+    def dumps(obj: Any) -> bytes:
+        """Serialize to compact single-line UTF-8 JSON."""
+        return orjson.dumps(obj, default=_default)
+
+    def dumps_pretty(obj: Any) -> bytes:
+        """Serialize to UTF-8 JSON indented by two spaces."""
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_INDENT_2)
+else:
+    def loads(data: Union[bytes, str]) -> Any:
+        """Parse JSON text."""
+        return json.loads(data)
+
+    def dumps(obj: Any) -> bytes:
+        """Serialize to compact single-line UTF-8 JSON."""
+        return json.dumps(obj, separators=(",", ":"), default=_default).encode("utf-8")
+
+    def dumps_pretty(obj: Any) -> bytes:
+        """Serialize to UTF-8 JSON indented by two spaces."""
+        return json.dumps(obj, indent=2, default=_default).encode("utf-8")
+
+
+def read_json(path: Union[str, Path]) -> Any:
+    """
+    Read a JSON file.
+
+    Args:
+        path: File to read
+
+    Returns:
+        Parsed JSON value
+    """
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+def write_json(path: Union[str, Path], obj: Any) -> None:
+    """
+    Atomically write a value to a JSON file, indented by two spaces.
+
+    Objects with a to_dict() method (e.g. Track) are serialized through it,
+    so callers can pass them without converting first.
+
+    The data goes to a temporary file next to the target which then replaces
+    it, so an interrupted write never leaves a truncated file behind.
+
+    Args:
+        path: File to write
+        obj: JSON-serializable value
+    """
+    _write_atomic(path, dumps_pretty(obj))
+
+
+def write_json_lines(path: Union[str, Path], objs: Iterable[Any]) -> None:
+    """
+    Atomically write values to a file as JSON lines, one value per line.
+
+    Args:
+        path: File to write
+        objs: JSON-serializable values
+    """
+    _write_atomic(path, b"".join(dumps(obj) + b"\n" for obj in objs))
+
+
+def append_json_line(path: Union[str, Path], obj: Any) -> None:
+    """
+    Append one value to a JSON lines file, creating it if needed.
+
+    The line goes out in a single write to a file opened for appending,
+    so the existing contents are never rewritten.
+
+    Args:
+        path: File to append to
+        obj: JSON-serializable value
+    """
+    with open(path, "ab") as f:
+        f.write(dumps(obj) + b"\n")
+
+
+def _write_atomic(path: Union[str, Path], data: bytes) -> None:
+    """Write data to a temporary file next to path, then replace path with it."""
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
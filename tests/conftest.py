@@ -2,12 +2,16 @@
 
 import pytest
 
+from spgit.utils.colors import reset_color_cache
+
 
 @pytest.fixture(autouse=True)
 def disable_colors():
     """Disable colors in tests."""
     import os
     os.environ["NO_COLOR"] = "1"
+    reset_color_cache()
     yield
     if "NO_COLOR" in os.environ:
         del os.environ["NO_COLOR"]
+    reset_color_cache()
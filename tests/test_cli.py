@@ -0,0 +1,91 @@
+"""Tests for the CLI entry point"""
+
+import io
+import sys
+
+from spgit.cli import _FASTPATH_ARGS, _PRINT_HELP_FAST, create_parser
+from spgit.commands.merge import merge_command
+from spgit.commands.rebase import rebase_command
+from spgit.core.objects import Commit, Track, Tree, create_tree_from_tracks, read_object, write_object
+from spgit.core.repository import Repository
+
+
+def test_fast_help_matches_parser(monkeypatch):
+    """The checked-in help text matches what argparse would print."""
+    monkeypatch.setenv("COLUMNS", "80")
+    monkeypatch.setattr(sys, "argv", ["spgit"])
+    assert _PRINT_HELP_FAST == create_parser(stubs=True).format_help()
+
+
+def test_fastpath_args_match_parser():
+    """Fast-path namespaces match what argparse produces for the same argv."""
+    for argv, expected in _FASTPATH_ARGS.items():
+        parser = create_parser(argv[0])
+        assert vars(parser.parse_args(list(argv))) == expected
+
+
+def test_merge_stdin_needs_no_branch():
+    """merge --stdin parses without a branch argument."""
+    args = create_parser("merge").parse_args(["merge", "--stdin"])
+    assert args.stdin and args.branch is None
+
+
+def test_merge_fast_forwards_to_descendant(tmp_path, monkeypatch, capsys):
+    """Merging a branch that contains HEAD moves the branch instead of merging."""
+    repo = Repository(tmp_path)
+    repo.init()
+    base = repo.get_head_commit()
+    tree = create_tree_from_tracks(repo, [Track("spotify:track:1", "Song 1", "Artist", "Album", 1000)])
+    feature = write_object(repo, Commit(tree=tree, parent=base, message="Add", author="A", committer="A"))
+    repo.create_branch("feature", feature)
+
+    monkeypatch.chdir(tmp_path)
+    assert merge_command(create_parser("merge").parse_args(["merge", "feature"])) == 0
+
+    assert "Fast-forward" in capsys.readouterr().out
+    assert Repository(tmp_path).get_head_commit() == feature
+
+
+def test_rebase_replays_only_own_commits_after_a_merge(tmp_path, monkeypatch):
+    """Rebasing a branch that merged the target replays only the branch's own commits."""
+    repo = Repository(tmp_path)
+    repo.init()
+    root = repo.get_head_commit()
+    mine = write_object(repo, Commit(tree={}, parent=root, message="Mine", author="A", committer="A"))
+    target = write_object(repo, Commit(tree={}, parent=root, message="Target", author="A", committer="A"))
+    merge = write_object(repo, Commit(tree={}, parent=None, parents=[mine, target],
+                                      message="Merge", author="A", committer="A"))
+    repo._update_ref("refs/heads/main", merge)
+    repo.create_branch("target", target)
+
+    monkeypatch.chdir(tmp_path)
+    assert rebase_command(create_parser("rebase").parse_args(["rebase", "target"])) == 0
+
+    messages = []
+    commit = Repository(tmp_path).get_head_commit()
+    while commit:
+        obj = read_object(repo, commit)
+        messages.append(obj.message)
+        commit = obj.parents[0] if obj.parents else None
+    assert messages == ["Merge", "Mine", "Target", "Initial commit"]
+
+
+def test_merge_stdin_prints_base_and_tree(tmp_path, monkeypatch, capsys):
+    """merge --stdin prints the merge base and the merged tree, leaving refs alone."""
+    repo = Repository(tmp_path)
+    repo.init()
+    root = repo.get_head_commit()
+    tree1 = create_tree_from_tracks(repo, [Track("spotify:track:1", "Song 1", "Artist", "Album", 1000)])
+    tree2 = create_tree_from_tracks(repo, [Track("spotify:track:2", "Song 2", "Artist", "Album", 1000)])
+    mine = write_object(repo, Commit(tree=tree1, parent=root, message="One", author="A", committer="A"))
+    theirs = write_object(repo, Commit(tree=tree2, parent=root, message="Two", author="A", committer="A"))
+    repo._update_ref("refs/heads/main", mine)
+    repo.create_branch("feature", theirs)
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(sys, "stdin", io.StringIO("main feature\nfeature main\n"))
+    assert merge_command(create_parser("merge").parse_args(["merge", "--stdin"])) == 0
+
+    merged = write_object(repo, Tree({**tree1, **tree2}))
+    assert capsys.readouterr().out.splitlines() == [f"{root} {merged}", f"{root} {merged}"]
+    assert Repository(tmp_path).get_head_commit() == mine
@@ -1,30 +1,26 @@
 """Tests for object database"""
 
 import pytest
-import tempfile
-import shutil
-from pathlib import Path
 from spgit.core.repository import Repository
 from spgit.core.objects import (
     Track, Blob, Tree, Commit, write_object, read_object,
-    create_tree_from_tracks, get_commit_tree, find_common_ancestor
+    create_tree_from_tracks, create_tree_from_track_dicts, get_commit_tree, find_common_ancestor, find_fork_point,
+    walk_commits_oldest_first, tree_contains, read_commit_parents
 )
+from spgit.core.commit_graph import load_commit_graph
 
 
 class TestObjects:
     """Test object database operations."""
 
-    @pytest.fixture
-    def temp_dir(self):
-        """Create temporary directory."""
-        temp = tempfile.mkdtemp()
-        yield Path(temp)
-        shutil.rmtree(temp)
-
-    @pytest.fixture
-    def repo(self, temp_dir):
-        """Create initialized repository."""
-        repo = Repository(temp_dir)
+    @pytest.fixture(scope="module")
+    def repo(self, tmp_path_factory):
+        """Create one initialized repository for all tests in this module.
+
+        Objects are content-addressed, so tests writing into the same store
+        do not disturb each other.
+        """
+        repo = Repository(tmp_path_factory.mktemp("objects_repo"))
         repo.init()
         return repo
 
@@ -95,6 +91,73 @@ class TestObjects:
         assert "spotify:track:1" in tree
         assert "spotify:track:2" in tree
 
+    def test_create_tree_from_many_tracks(self, repo):
+        """Test the packed write path matches writing blobs one by one."""
+        tracks = [
+            Track(f"spotify:track:{i}", f"Song {i}", "Artist", "Album", 180000, added_at="2024-01-01")
+            for i in range(200)
+        ]
+
+        tree = create_tree_from_tracks(repo, tracks)
+
+        assert list(tree) == [track.uri for track in tracks]
+        for track in tracks:
+            assert tree[track.uri] == write_object(repo, Blob(track))
+            assert read_object(repo, tree[track.uri]).track.name == track.name
+
+    def test_create_tree_from_track_dicts(self, repo):
+        """Test trees built from raw dictionaries match trees built from tracks."""
+        tracks = [
+            Track(f"spotify:track:{i}", f"Song {i}", "Artist", "Album", 180000, added_at="2024-01-01")
+            for i in range(3)
+        ]
+
+        tree = create_tree_from_track_dicts(repo, (track.to_dict() for track in tracks))
+
+        assert tree == create_tree_from_tracks(repo, tracks)
+
+    def test_large_trees_are_packed(self, repo):
+        """Test large batches of blobs go into one pack and read back from it."""
+        tracks = [Track(f"spotify:track:{i}", f"Song {i}", "Artist", "Album", 1000) for i in range(100)]
+        pack_dir = repo.objects_dir / "pack"
+        packs = len(list(pack_dir.glob("*.pack")))
+
+        tree = create_tree_from_tracks(repo, tracks)
+
+        assert len(list(pack_dir.glob("*.pack"))) == packs + 1
+        assert not (repo.objects_dir / tree["spotify:track:0"][:2] / tree["spotify:track:0"][2:]).exists()
+        assert read_object(repo, tree["spotify:track:42"]).track.name == "Song 42"
+
+        # Blobs that are already stored are not packed again
+        create_tree_from_tracks(repo, tracks)
+        assert len(list(pack_dir.glob("*.pack"))) == packs + 1
+
+        # Re-syncing with a few changed tracks writes only the new blobs, loose
+        tracks[0] = Track("spotify:track:0", "Renamed", "Artist", "Album", 1000)
+        tree = create_tree_from_tracks(repo, tracks)
+        assert len(list(pack_dir.glob("*.pack"))) == packs + 1
+        assert (repo.objects_dir / tree["spotify:track:0"][:2] / tree["spotify:track:0"][2:]).exists()
+        assert read_object(repo, tree["spotify:track:0"]).track.name == "Renamed"
+
+    def test_read_object_is_cached(self, repo):
+        """Test an object is parsed once and then served from the cache."""
+        commit_hash = write_object(repo, Commit(tree={}, parent=None, message="C", author="A", committer="A"))
+
+        assert read_object(repo, commit_hash) is read_object(repo, commit_hash)
+        with pytest.raises(ValueError):
+            read_object(repo, "0" * 40)
+
+    def test_read_commit_parents(self, repo):
+        """Test reading parents without decoding the rest of the commit."""
+        tracks = {f"spotify:track:{i}": "a" * 40 for i in range(2000)}
+        hash1 = write_object(repo, Commit(tree={}, parent=None, message="C1", author="A", committer="A"))
+        hash2 = write_object(repo, Commit(tree=tracks, parent=hash1, message='say "parents": [x]',
+                                          author="A", committer="A"))
+
+        assert read_commit_parents(repo, hash1) == []
+        assert read_commit_parents(repo, hash2) == [hash1]
+        assert read_commit_parents(repo, write_object(repo, Blob(Track("u", "n", "a", "b", 1)))) == []
+
     def test_get_commit_tree(self, repo):
         """Test getting tracks from commit."""
         tracks = [
@@ -138,3 +201,81 @@ class TestObjects:
         # Find common ancestor
         ancestor = find_common_ancestor(repo, hash3, hash4)
         assert ancestor == hash2
+
+    def test_find_common_ancestor_of_ancestor_and_descendant(self, repo):
+        """Test the ancestor is the merge base whichever side it is passed on."""
+        hash1 = write_object(repo, Commit(tree={}, parent=None, message="C1", author="A", committer="A"))
+        hash2 = write_object(repo, Commit(tree={}, parent=hash1, message="C2", author="A", committer="A"))
+        hash3 = write_object(repo, Commit(tree={}, parent=hash2, message="C3", author="A", committer="A"))
+
+        for ancestor, descendant in ((hash1, hash2), (hash1, hash3), (hash2, hash3)):
+            assert find_common_ancestor(repo, ancestor, descendant) == ancestor
+            assert find_common_ancestor(repo, descendant, ancestor) == ancestor
+
+    def test_find_common_ancestor_uses_commit_graph(self, repo):
+        """Test merge bases across a merge commit and the saved commit graph."""
+        hash1 = write_object(repo, Commit(tree={}, parent=None, message="C1", author="A", committer="A"))
+        hash2 = write_object(repo, Commit(tree={}, parent=hash1, message="C2", author="A", committer="A"))
+        hash3 = write_object(repo, Commit(tree={}, parent=hash1, message="C3", author="A", committer="A"))
+        merge = write_object(repo, Commit(tree={}, parent=None, parents=[hash2, hash3],
+                                          message="M", author="A", committer="A"))
+        hash4 = write_object(repo, Commit(tree={}, parent=hash3, message="C4", author="A", committer="A"))
+
+        assert find_common_ancestor(repo, merge, hash4) == hash3
+        assert find_common_ancestor(repo, hash2, hash4) == hash1
+
+        graph = load_commit_graph(repo)
+        assert graph[merge] == [3, [hash2, hash3]]
+        assert graph[hash1] == [1, []]
+
+    def test_find_fork_point(self, repo):
+        """Test finding the fork point and the commits after it."""
+        hash1 = write_object(repo, Commit(tree={}, parent=None, message="C1", author="A", committer="A"))
+        hash2 = write_object(repo, Commit(tree={}, parent=hash1, message="C2", author="A", committer="A"))
+        hash3 = write_object(repo, Commit(tree={}, parent=hash2, message="C3", author="A", committer="A"))
+        hash4 = write_object(repo, Commit(tree={}, parent=hash3, message="C4", author="A", committer="A"))
+        hash5 = write_object(repo, Commit(tree={}, parent=hash2, message="C5", author="A", committer="A"))
+
+        cache = {}
+        assert find_fork_point(repo, hash4, hash5, cache) == (hash2, [hash3, hash4])
+        assert cache[hash4].message == "C4"
+        assert find_fork_point(repo, hash4, hash2) == (hash2, [hash3, hash4])
+        assert find_fork_point(repo, hash2, hash4) == (hash2, [])
+
+    def test_find_fork_point_through_merge(self, repo):
+        """Test the fork is on commit1's first-parent line when it merged commit2."""
+        root = write_object(repo, Commit(tree={}, parent=None, message="R", author="A", committer="A"))
+        mine = write_object(repo, Commit(tree={}, parent=root, message="M1", author="A", committer="A"))
+        target = write_object(repo, Commit(tree={}, parent=root, message="T", author="A", committer="A"))
+        merge = write_object(repo, Commit(tree={}, parent=None, parents=[mine, target],
+                                          message="Merge", author="A", committer="A"))
+
+        assert find_fork_point(repo, merge, target) == (root, [mine, merge])
+
+    def test_walk_commits_oldest_first(self, repo):
+        """Test walking history from the root commit forward."""
+        commit1 = Commit(tree={}, parent=None, message="C1", author="A", committer="A")
+        hash1 = write_object(repo, commit1)
+
+        commit2 = Commit(tree={}, parent=hash1, message="C2", author="A", committer="A")
+        hash2 = write_object(repo, commit2)
+
+        commit3 = Commit(tree={}, parent=hash2, message="C3", author="A", committer="A")
+        hash3 = write_object(repo, commit3)
+
+        assert list(walk_commits_oldest_first(repo, hash3)) == [hash1, hash2, hash3]
+
+    def test_tree_contains(self, repo):
+        """Test looking up a single track in a commit."""
+        tracks = [Track("spotify:track:1", "Song 1", "Artist 1", "Album 1", 180000)]
+        tree = create_tree_from_tracks(repo, tracks)
+        commit = Commit(tree=tree, parent=None, message="Test", author="Test", committer="Test")
+        commit_hash = write_object(repo, commit)
+
+        found, track = tree_contains(repo, commit_hash, "spotify:track:1")
+        assert found
+        assert track.name == "Song 1"
+
+        found, track = tree_contains(repo, commit_hash, "spotify:track:2")
+        assert not found
+        assert track is None
@@ -1,21 +1,17 @@
 """Tests for repository functionality"""
 
 import pytest
-import tempfile
-import shutil
-from pathlib import Path
 from spgit.core.repository import Repository, find_repository
+from spgit.core.objects import Track, create_tree_from_tracks
 
 
 class TestRepository:
     """Test repository operations."""
 
     @pytest.fixture
-    def temp_dir(self):
+    def temp_dir(self, tmp_path):
         """Create temporary directory."""
-        temp = tempfile.mkdtemp()
-        yield Path(temp)
-        shutil.rmtree(temp)
+        return tmp_path
 
     def test_init_creates_structure(self, temp_dir):
         """Test that init creates proper directory structure."""
@@ -111,6 +107,20 @@ class TestRepository:
         config = repo.read_config()
         assert config["test"]["key"] == "value"
 
+    def test_config_cache(self, temp_dir):
+        """Test cached config is copied out and refreshed when the file changes."""
+        repo = Repository(temp_dir)
+        repo.init()
+        repo.update_config("test", "key", "value")
+
+        # Changing a returned config does not change the cached one
+        repo.read_config()["test"]["key"] = "changed"
+        assert repo.read_config()["test"]["key"] == "value"
+
+        # Writes from another Repository instance are picked up
+        Repository(temp_dir).update_config("test", "key", "other value")
+        assert repo.read_config()["test"]["key"] == "other value"
+
     def test_remote_operations(self, temp_dir):
         """Test remote management."""
         repo = Repository(temp_dir)
@@ -131,3 +141,68 @@ class TestRepository:
         repo.remove_remote("origin")
         remotes = repo.list_remotes()
         assert "origin" not in remotes
+
+    def test_commit_tracks(self, temp_dir):
+        """Test commit_tracks advances the branch, reflog and index."""
+        repo = Repository(temp_dir)
+        repo.init()
+        parent = repo.get_head_commit()
+
+        tree = {"spotify:track:1": "a" * 40}
+        tracks = {"spotify:track:1": {"uri": "spotify:track:1", "name": "Song"}}
+        commit_hash = repo.commit_tracks("main", tree, "Add song", parent=parent, tracks=tracks)
+
+        assert repo.get_head_commit() == commit_hash
+        assert repo.read_object(commit_hash).parents == [parent]
+        assert repo.read_index() == {"tree": tree, "tracks": tracks}
+        reflog = (repo.logs_dir / "refs" / "heads" / "main").read_text().splitlines()
+        assert reflog[-1] == f"{parent} {commit_hash} commit: Add song"
+
+    def test_update_index_from_commit(self, temp_dir):
+        """Test the index is rebuilt from a commit's stored tree."""
+        repo = Repository(temp_dir)
+        repo.init()
+
+        track = Track("spotify:track:1", "Song", "Artist", "Album", 1000)
+        tree = create_tree_from_tracks(repo, [track])
+        commit_hash = repo.commit_tracks("main", tree, "Add song", parent=repo.get_head_commit())
+        repo.update_index({"tree": {}, "tracks": {}})
+
+        repo.update_index_from_commit(commit_hash)
+
+        index = repo.read_index()
+        assert index["tree"] == tree
+        assert index["tracks"]["spotify:track:1"]["name"] == "Song"
+
+        # Already matching: the index is left alone
+        repo.update_index({"tree": tree, "tracks": {}})
+        repo.update_index_from_commit(commit_hash)
+        assert repo.read_index()["tracks"] == {}
+
+    def test_stash_log(self, temp_dir):
+        """Test stash pushes and drops are appended, then compacted."""
+        repo = Repository(temp_dir)
+        repo.init()
+
+        for i in range(4):
+            repo.push_stash({"index": {}, "message": f"s{i}"})
+        repo.drop_stash(1)
+
+        assert [e["message"] for e in repo.read_stash()] == ["s0", "s2", "s3"]
+        assert len(repo.stash_path.read_bytes().splitlines()) == 5
+
+        # A second drop would leave more tombstones than half the entries
+        repo.drop_stash(2)
+        assert [e["message"] for e in repo.read_stash()] == ["s0", "s2"]
+        assert len(repo.stash_path.read_bytes().splitlines()) == 2
+
+    def test_stash_reads_array_format(self, temp_dir):
+        """Test a stash written as a single JSON array is read and converted."""
+        repo = Repository(temp_dir)
+        repo.init()
+        repo.stash_path.write_text('[{"index": {}, "message": "old"}]')
+
+        repo.push_stash({"index": {}, "message": "new"})
+
+        assert [e["message"] for e in repo.read_stash()] == ["old", "new"]
+        assert repo.stash_path.read_bytes().startswith(b'{"op"')
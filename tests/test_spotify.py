@@ -0,0 +1,129 @@
+"""Tests for Spotify client helpers"""
+
+from spgit.core.objects import Track
+from spgit.core.spotify import SpotifyClient
+
+
+class FakeSpotify:
+    """Minimal stand-in for spotipy.Spotify serving a paged playlist."""
+
+    def __init__(self, total):
+        self.total = total
+
+    def playlist_items(self, playlist_id, offset=0, limit=100, fields=None):
+        items = [
+            {
+                "track": {"uri": f"spotify:track:{i}", "name": f"Track {i}", "artists": []},
+                "added_at": None,
+                "added_by": {},
+            }
+            for i in range(offset, min(offset + limit, self.total))
+        ]
+        return {"items": items, "total": self.total}
+
+
+class EditableFakeSpotify(FakeSpotify):
+    """FakeSpotify whose playlist can be edited, recording each write."""
+
+    def __init__(self, uris):
+        super().__init__(len(uris))
+        self.uris = list(uris)
+        self.calls = []
+
+    def playlist_items(self, playlist_id, offset=0, limit=100, fields=None):
+        items = [
+            {"track": {"uri": uri, "name": uri, "artists": []}, "added_at": None, "added_by": {}}
+            for uri in self.uris[offset:offset + limit]
+        ]
+        return {"items": items, "total": len(self.uris)}
+
+    def playlist_add_items(self, playlist_id, uris):
+        self.calls.append("add")
+        self.uris.extend(uris)
+
+    def playlist_remove_all_occurrences_of_items(self, playlist_id, uris):
+        self.calls.append("remove")
+        self.uris = [uri for uri in self.uris if uri not in uris]
+
+    def playlist_replace_items(self, playlist_id, uris):
+        self.calls.append("replace")
+        self.uris = list(uris)
+
+
+def make_client(total):
+    """Build a SpotifyClient backed by FakeSpotify without authenticating."""
+    client = SpotifyClient.__new__(SpotifyClient)
+    client.sp = FakeSpotify(total)
+    client._track_cache = {}
+    return client
+
+
+def test_parallel_fetch_keeps_playlist_order():
+    """Test pages fetched concurrently come back in playlist order."""
+    client = make_client(350)
+    tracks = client.get_playlist_tracks("pl", workers=4)
+
+    uris = [f"spotify:track:{i}" for i in range(350)]
+    assert [t.uri for t in tracks] == uris
+    assert [t.uri for t in make_client(350).get_playlist_tracks("pl")] == uris
+
+
+def test_parallel_fetch_empty_playlist():
+    """Test an empty playlist needs only the first page."""
+    assert make_client(0).get_playlist_tracks("pl") == []
+
+
+def test_playlist_tracks_are_cached():
+    """Test a second fetch is served from the cache until the playlist changes."""
+    client = make_client(150)
+    first = client.get_playlist_tracks("pl")
+
+    client.sp.total = 0
+    assert client.get_playlist_tracks("pl") == first
+
+    client._track_cache.pop("pl")
+    assert client.get_playlist_tracks("pl") == []
+
+
+def test_raw_tracks_match_track_dicts():
+    """Test raw track dictionaries match Track.to_dict() for the same playlist."""
+    client = make_client(120)
+    raw = client.get_playlist_tracks_raw("pl")
+
+    assert list(raw) == [f"spotify:track:{i}" for i in range(120)]
+    assert raw == {t.uri: t.to_dict() for t in client.get_playlist_tracks("pl")}
+
+
+def test_get_playlist_id():
+    """Test playlist IDs are extracted from URLs and URIs."""
+    client = make_client(0)
+
+    assert client.get_playlist_id("https://open.spotify.com/playlist/37i9dQZF1DX?si=abc") == "37i9dQZF1DX"
+    assert client.get_playlist_id("spotify:playlist:37i9dQZF1DX") == "37i9dQZF1DX"
+    assert client.get_playlist_id("37i9dQZF1DX") == "37i9dQZF1DX"
+
+
+def test_sync_playlist_sends_only_changes():
+    """Test syncing removes and appends tracks without replacing the playlist."""
+    client = make_client(0)
+    client.sp = EditableFakeSpotify(["a", "b", "c"])
+    tracks = [Track(uri, uri, "", "", 0) for uri in ["a", "c", "d"]]
+
+    assert client.sync_playlist("pl", tracks) == (1, 1)
+    assert client.sp.uris == ["a", "c", "d"]
+    assert client.sp.calls == ["remove", "add"]
+
+    client.sp.calls = []
+    assert client.sync_playlist("pl", tracks) == (0, 0)
+    assert client.sp.calls == []
+
+
+def test_sync_playlist_replaces_on_reorder():
+    """Test a change in order falls back to replacing the playlist."""
+    client = make_client(0)
+    client.sp = EditableFakeSpotify(["a", "b"])
+    tracks = [Track(uri, uri, "", "", 0) for uri in ["b", "a"]]
+
+    client.sync_playlist("pl", tracks)
+    assert client.sp.uris == ["b", "a"]
+    assert client.sp.calls == ["replace"]
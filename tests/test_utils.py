@@ -2,9 +2,12 @@
 
 import pytest
 from spgit.utils.helpers import (
-    format_duration, truncate, pluralize, format_table
+    format_duration, truncate, pluralize, format_table, tail_lines,
+    load_ignore_patterns, should_ignore
 )
 from spgit.utils.colors import colorize, Colors
+from spgit.utils.errors import spgit_command
+from spgit.utils.jsonio import read_json, write_json
 
 
 class TestHelpers:
@@ -30,6 +33,34 @@ class TestHelpers:
         assert pluralize(2, "track") == "2 tracks"
         assert pluralize(2, "commit", "commits") == "2 commits"
 
+    def test_tail_lines(self, tmp_path):
+        """Test reading the last lines of a file."""
+        path = tmp_path / "log"
+        path.write_text("".join(f"line {i}\n" for i in range(100)))
+
+        assert tail_lines(path, 3) == ["line 97", "line 98", "line 99"]
+        assert tail_lines(path, 3, block_size=5) == ["line 97", "line 98", "line 99"]
+        assert len(tail_lines(path, 500)) == 100
+        assert tail_lines(path, 0) == []
+
+    def test_ignore_patterns(self, tmp_path):
+        """Test .spgitignore globs are matched against whole URIs."""
+        class FakeRepo:
+            work_dir = tmp_path
+
+        assert not should_ignore("spotify:track:abc123", load_ignore_patterns(FakeRepo))
+
+        (tmp_path / ".spgitignore").write_text(
+            "# comment\nspotify:track:abc*\n\nspotify:track:x?z\nspotify:track:[0-9]\n"
+        )
+        matcher = load_ignore_patterns(FakeRepo)
+
+        assert should_ignore("spotify:track:abc123", matcher)
+        assert should_ignore("spotify:track:xyz", matcher)
+        assert should_ignore("spotify:track:7", matcher)
+        assert not should_ignore("spotify:track:xyz1", matcher)
+        assert not should_ignore("spotify:track:def", matcher)
+
     def test_format_table(self):
         """Test table formatting."""
         rows = [
@@ -62,3 +93,47 @@ class TestColors:
         assert not color_enabled()
 
         del os.environ["NO_COLOR"]
+
+
+class TestErrors:
+    """Test error handling helpers."""
+
+    def test_spgit_command_exit_codes(self, capsys):
+        """Test the command decorator maps failures to exit codes."""
+        @spgit_command(show_traceback=False)
+        def failing(args):
+            raise ValueError("boom")
+
+        @spgit_command
+        def interrupted(args):
+            raise KeyboardInterrupt
+
+        assert failing(None) == 1
+        assert "Fatal: boom" in capsys.readouterr().out
+        assert interrupted(None) == 130
+
+
+class TestJsonIO:
+    """Test JSON file helpers."""
+
+    def test_round_trip(self, tmp_path):
+        """Test values survive a write/read cycle."""
+        data = {"tracks": {"spotify:track:1": {"name": "Café", "duration_ms": 1000}}}
+        path = tmp_path / "index"
+
+        write_json(path, data)
+
+        assert read_json(path) == data
+        assert path.read_text(encoding="utf-8").startswith('{\n  "tracks"')
+        assert list(tmp_path.iterdir()) == [path]
+
+    def test_writes_objects_with_to_dict(self, tmp_path):
+        """Test objects providing to_dict() are written as their dict."""
+        from spgit.core.objects import Track
+
+        track = Track("spotify:track:1", "Song", "Artist", "Album", 1000, added_at="2024-01-01")
+        path = tmp_path / "index"
+
+        write_json(path, {"tracks": {track.uri: track}})
+
+        assert read_json(path) == {"tracks": {track.uri: track.to_dict()}}
@@ -7,12 +7,12 @@ Run this to verify that spgit is properly installed and working.
 import sys
 import os
 import tempfile
-import shutil
 from pathlib import Path
 
 
 def print_header(text):
-    """Print section header."""
+    """Print section header, writing out the previous section first."""
+    sys.stdout.flush()
     print(f"\n{'=' * 60}")
     print(f"  {text}")
     print(f"{'=' * 60}\n")
@@ -50,16 +50,14 @@ def test_imports():
         return False
 
 
-def test_repository():
+def test_repository(temp_dir: Path):
     """Test repository operations."""
     print_header("Testing Repository Operations")
 
     try:
         from spgit.core.repository import Repository
 
-        # Create temporary directory
-        temp_dir = tempfile.mkdtemp()
-        print(f"Created temp directory: {temp_dir}")
+        print(f"Using temp directory: {temp_dir}")
 
         # Initialize repository
         repo = Repository(temp_dir)
@@ -93,19 +91,16 @@ def test_repository():
         assert repo.get_current_branch() == "test-branch", "Checkout failed"
         print("✓ Branch checkout works")
 
-        # Cleanup
-        shutil.rmtree(temp_dir)
-        print("✓ Cleanup successful")
-
         return True
     except Exception as e:
         print(f"✗ Repository test failed: {e}")
         import traceback
+        sys.stdout.flush()
         traceback.print_exc()
         return False
 
 
-def test_objects():
+def test_objects(temp_dir: Path):
     """Test object database."""
     print_header("Testing Object Database")
 
@@ -114,7 +109,6 @@ def test_objects():
         from spgit.core.objects import Track, Blob, Commit, write_object, read_object
 
         # Create temporary repository
-        temp_dir = tempfile.mkdtemp()
         repo = Repository(temp_dir)
         repo.init()
 
@@ -155,14 +149,11 @@ def test_objects():
         assert commit2.message == "Test commit", "Commit message mismatch"
         print("✓ Read commit successfully")
 
-        # Cleanup
-        shutil.rmtree(temp_dir)
-        print("✓ Cleanup successful")
-
         return True
     except Exception as e:
         print(f"✗ Object test failed: {e}")
         import traceback
+        sys.stdout.flush()
         traceback.print_exc()
         return False
 
@@ -239,17 +230,23 @@ def test_cli():
 
 def main():
     """Run all tests."""
+    # Write a section at a time rather than one write() per line on a terminal
+    if hasattr(sys.stdout, "reconfigure"):
+        sys.stdout.reconfigure(line_buffering=False)
+
     print_header("spgit Verification Script")
     print("This script will verify that spgit is properly installed")
     print("and all core functionality is working.")
 
-    results = {
-        "Imports": test_imports(),
-        "Repository": test_repository(),
-        "Objects": test_objects(),
-        "Utilities": test_utils(),
-        "CLI": test_cli(),
-    }
+    # One scratch directory for every test, removed once at the end
+    with tempfile.TemporaryDirectory() as root:
+        results = {
+            "Imports": test_imports(),
+            "Repository": test_repository(Path(root) / "repo"),
+            "Objects": test_objects(Path(root) / "objects"),
+            "Utilities": test_utils(),
+            "CLI": test_cli(),
+        }
 
     # Summary
     print_header("Test Summary")